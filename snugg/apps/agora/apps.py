@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AgoraConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "snugg.apps.agora"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,273 @@
+import csv
+import time
+from itertools import islice
+
+import orjson
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from snugg.apps.agora.catalog import CATALOG_NAMESPACE
+from snugg.apps.agora.models import CatalogVersion, Lecture, Semester
+from snugg.apps.univ.models import College, Major, University
+from snugg.cache import response_cache
+
+SEASONS = {display: value for value, display in Semester.SEASON_CHOICES}
+TEXT_FIELDS = ("lecture_id", "name", "instructor")
+
+# Unchanged lectures are not rewritten, but read back for their semesters.
+# The second SELECT does not see the rows inserted by the upsert.
+UPSERT_SQL = f"""
+WITH imported (lecture_id, university_id, name, instructor, college_id, major_id) AS (
+    SELECT * FROM UNNEST(
+        %s::varchar[], %s::bigint[], %s::varchar[], %s::varchar[],
+        %s::bigint[], %s::bigint[]
+    )
+), upserted AS (
+    INSERT INTO {Lecture._meta.db_table} AS lecture
+        (lecture_id, university_id, name, instructor, college_id, major_id)
+    SELECT * FROM imported
+    ON CONFLICT ON CONSTRAINT unique_lecture DO UPDATE SET
+        name = EXCLUDED.name,
+        instructor = EXCLUDED.instructor,
+        college_id = EXCLUDED.college_id,
+        major_id = EXCLUDED.major_id
+    WHERE (lecture.name, lecture.instructor, lecture.college_id, lecture.major_id)
+        IS DISTINCT FROM
+        (EXCLUDED.name, EXCLUDED.instructor, EXCLUDED.college_id, EXCLUDED.major_id)
+    RETURNING lecture.id, lecture.lecture_id, lecture.university_id,
+        CASE WHEN lecture.xmax = 0 THEN 'created' ELSE 'updated' END
+)
+SELECT * FROM upserted
+UNION ALL
+SELECT lecture.id, lecture.lecture_id, lecture.university_id, 'unchanged'
+FROM {Lecture._meta.db_table} AS lecture
+JOIN imported USING (lecture_id, university_id)
+WHERE NOT EXISTS (SELECT FROM upserted WHERE upserted.id = lecture.id)
+"""
+LINK_SQL = f"""
+INSERT INTO {Lecture.semesters.through._meta.db_table} (lecture_id, semester_id)
+SELECT * FROM UNNEST(%s::bigint[], %s::bigint[])
+ON CONFLICT DO NOTHING
+"""
+
+
+class RowError(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Import a catalog of Agora lectures from a CSV file or a JSON Lines file, "
+        "upserting them by their id and university, batch by batch. "
+        "The columns are lecture_id, name, instructor, university, college, major "
+        "and semesters, e.g. 'Spring 2022;Fall 2022'. The university, college and "
+        "major are given by name, and must exist. Invalid rows are reported and "
+        "skipped. The running servers see the new catalog within a second of the "
+        "end of the import, but the cached lecture responses only once they "
+        "expire, unless the cache is shared with them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=("csv", "jsonl"))
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["format"] or path.rsplit(".", 1)[-1].lower()
+        if file_format not in ("csv", "jsonl"):
+            raise CommandError("The format is either csv or jsonl.")
+
+        self.load_names()
+        self.counts = dict.fromkeys(("created", "updated", "unchanged", "linked"), 0)
+        self.skipped = 0
+        started = time.perf_counter()
+        total = 0
+
+        try:
+            with open(path, newline="", encoding="utf-8-sig") as file:
+                if file_format == "csv":
+                    rows = self.iter_rows(csv.DictReader(file))
+                else:
+                    rows = self.iter_rows(file, decode=self.decode_line)
+
+                while True:
+                    batch = list(islice(rows, options["batch_size"]))
+                    if not batch:
+                        break
+
+                    self.import_batch(batch)
+                    total += len(batch)
+                    elapsed = time.perf_counter() - started
+                    self.stdout.write(
+                        f"Imported {total} lectures ({total / elapsed:.0f} rows/s)"
+                    )
+        finally:
+            # Signals are not sent by the bulk statements, the catalog and the
+            # cached responses are invalidated once for the whole import,
+            # not to rebuild the catalog after every batch.
+            if total:
+                CatalogVersion.objects.bump()
+                response_cache.invalidate(CATALOG_NAMESPACE, "agora:lectures")
+
+        elapsed = time.perf_counter() - started
+        summary = ", ".join(f"{count} {name}" for name, count in self.counts.items())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {total} lectures in {elapsed:.1f} s "
+                f"({total / elapsed:.0f} rows/s): {summary}, {self.skipped} skipped."
+            )
+        )
+
+    def load_names(self):
+        self.universities = dict(University.objects.values_list("name", "pk"))
+        self.colleges = {
+            (university, name): pk
+            for university, name, pk in College.objects.values_list(
+                "university", "name", "pk"
+            )
+        }
+        self.majors = {
+            (university, name): pk
+            for university, name, pk in Major.objects.values_list(
+                "university", "name", "pk"
+            )
+        }
+        self.semesters = {
+            (year, season): pk
+            for year, season, pk in Semester.objects.values_list("year", "season", "pk")
+        }
+
+    def iter_rows(self, records, decode=None):
+        for number, record in enumerate(records, start=1):
+            try:
+                if decode is not None:
+                    record = decode(record)
+                    if record is None:
+                        continue
+                yield self.parse_row(record)
+            except RowError as error:
+                self.skipped += 1
+                self.stderr.write(f"Skipped row {number}: {error}")
+
+    def decode_line(self, line):
+        if not line.strip():
+            return None
+
+        try:
+            record = orjson.loads(line)
+        except orjson.JSONDecodeError as error:
+            raise RowError(f"Invalid JSON: {error}")
+        if not isinstance(record, dict):
+            raise RowError("Not a JSON object.")
+
+        return record
+
+    def get_text(self, record, name):
+        value = record.get(name)
+        if value is None:
+            return ""
+        if not isinstance(value, str):
+            raise RowError(f"{name} must be a string.")
+
+        return value.strip()
+
+    def parse_row(self, record):
+        values = {}
+        for name in TEXT_FIELDS:
+            value = self.get_text(record, name)
+            max_length = Lecture._meta.get_field(name).max_length
+            if not value or len(value) > max_length:
+                raise RowError(f"{name} must have 1 to {max_length} characters.")
+            values[name] = value
+
+        university = self.resolve(self.universities, "university", record)
+        values["university"] = university
+        values["college"] = self.resolve(
+            self.colleges, "college", record, university, required=False
+        )
+        values["major"] = self.resolve(
+            self.majors, "major", record, university, required=False
+        )
+
+        semesters = record.get("semesters") or []
+        if isinstance(semesters, str):
+            semesters = semesters.split(";")
+        if not isinstance(semesters, list) or not all(
+            isinstance(name, str) for name in semesters
+        ):
+            raise RowError("semesters must be a list of names.")
+        values["semesters"] = {
+            self.parse_semester(name) for name in semesters if name.strip()
+        }
+
+        return values
+
+    def resolve(self, names, kind, record, university=None, required=True):
+        name = self.get_text(record, kind)
+        if not name and not required:
+            return None
+
+        key = name if university is None else (university, name)
+        if key not in names:
+            raise RowError(f"Unknown {kind} {name!r}.")
+
+        return names[key]
+
+    def parse_semester(self, name):
+        try:
+            season, year = name.split()
+            return int(year), SEASONS[season]
+        except (KeyError, ValueError):
+            raise RowError(f"Unknown semester {name!r}.")
+
+    def import_batch(self, batch):
+        # The last one wins, a statement not updating the same row twice.
+        rows = {(row["lecture_id"], row["university"]): row for row in batch}
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                UPSERT_SQL,
+                [
+                    [row[name] for row in rows.values()]
+                    for name in (
+                        "lecture_id",
+                        "university",
+                        "name",
+                        "instructor",
+                        "college",
+                        "major",
+                    )
+                ],
+            )
+            ids = {}
+            for pk, lecture_id, university, outcome in cursor.fetchall():
+                ids[lecture_id, university] = pk
+                self.counts[outcome] += 1
+
+            self.counts["linked"] += self.link_semesters(cursor, rows, ids)
+
+    def link_semesters(self, cursor, rows, ids):
+        needed = set().union(*(row["semesters"] for row in rows.values()))
+        missing = needed - set(self.semesters)
+        if missing:
+            Semester.objects.bulk_create(
+                (Semester(year=year, season=season) for year, season in missing),
+                ignore_conflicts=True,
+            )
+            self.semesters.update(
+                ((year, season), pk)
+                for year, season, pk in Semester.objects.filter(
+                    year__in={year for year, _ in missing}
+                ).values_list("year", "season", "pk")
+            )
+
+        lectures, semesters = [], []
+        for key, row in rows.items():
+            for semester in row["semesters"]:
+                lectures.append(ids[key])
+                semesters.append(self.semesters[semester])
+        cursor.execute(LINK_SQL, [lectures, semesters])
+
+        # Only the new links are counted.
+        return cursor.rowcount
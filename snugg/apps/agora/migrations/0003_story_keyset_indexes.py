@@ -0,0 +1,36 @@
+# Generated by Django 4.0.2 on 2026-10-18 08:52
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # The indexes are built without locking the tables against writes.
+    atomic = False
+
+    dependencies = [
+        ("agora", "0002_story_delete_post"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="story",
+            index=models.Index(fields=["-created_at"], name="agora_story_created_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="story",
+            index=models.Index(fields=["-updated_at"], name="agora_story_updated_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="story",
+            index=models.Index(
+                fields=["lecture", "-created_at"], name="agora_story_lect_created_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="story",
+            index=models.Index(
+                fields=["writer", "-created_at"], name="agora_story_writer_created_idx"
+            ),
+        ),
+    ]
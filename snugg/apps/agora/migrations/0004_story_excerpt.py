@@ -0,0 +1,20 @@
+# Generated by Django 4.0.2 on 2026-10-18 09:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agora", "0003_story_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="story",
+            name="excerpt",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=120
+            ),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.0.2 on 2026-10-18 09:36
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # The indexes are built without locking the table against writes.
+    atomic = False
+
+    dependencies = [
+        ("agora", "0004_story_excerpt"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name="lecture",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"), name="gin_trgm_ops"
+                ),
+                name="agora_lecture_name_trgm",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="lecture",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("lecture_id"),
+                    name="gin_trgm_ops",
+                ),
+                name="agora_lecture_id_trgm",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="lecture",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("instructor"),
+                    name="gin_trgm_ops",
+                ),
+                name="agora_lecture_instructor_trgm",
+            ),
+        ),
+    ]
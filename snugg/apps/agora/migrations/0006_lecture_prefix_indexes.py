@@ -0,0 +1,38 @@
+# Generated by Django 4.0.2 on 2026-10-18 09:52
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # The indexes are built without locking the table against writes.
+    atomic = False
+
+    dependencies = [
+        ("agora", "0005_lecture_trigram_indexes"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="lecture",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"),
+                    name="text_pattern_ops",
+                ),
+                name="agora_lecture_name_prefix",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="lecture",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("lecture_id"),
+                    name="text_pattern_ops",
+                ),
+                name="agora_lecture_id_prefix",
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.0.2 on 2026-10-18 12:40
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # The index is built without locking the table against writes.
+    atomic = False
+
+    dependencies = [
+        ("agora", "0006_lecture_prefix_indexes"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="lecture",
+            index=models.Index(fields=["name", "id"], name="agora_lecture_name_pk"),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.0.2 on 2026-10-18 13:10
+
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agora", "0007_lecture_name_pk_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CatalogVersion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("version", models.UUIDField(default=uuid.uuid4)),
+            ],
+        ),
+    ]
@@ -1,7 +1,12 @@
+import uuid
+
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 
 from snugg.apps.univ.models import College, Major, University
+from snugg.excerpts import EXCERPT_LENGTH, make_excerpt
 
 User = get_user_model()
 
@@ -27,6 +32,32 @@ class Lecture(models.Model):
                 fields=("lecture_id", "university"), name="unique_lecture"
             ),
         )
+        indexes = (
+            # Back the case-insensitive substring and similarity searches.
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="agora_lecture_name_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("lecture_id"), name="gin_trgm_ops"),
+                name="agora_lecture_id_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("instructor"), name="gin_trgm_ops"),
+                name="agora_lecture_instructor_trgm",
+            ),
+            # Back the prefix matches of the autocompletion.
+            models.Index(
+                OpClass(Upper("name"), name="text_pattern_ops"),
+                name="agora_lecture_name_prefix",
+            ),
+            models.Index(
+                OpClass(Upper("lecture_id"), name="text_pattern_ops"),
+                name="agora_lecture_id_prefix",
+            ),
+            # Back the keyset pagination.
+            models.Index(fields=("name", "id"), name="agora_lecture_name_pk"),
+        )
 
 
 class Story(models.Model):
@@ -38,9 +69,34 @@ class Story(models.Model):
     )
     title = models.CharField(max_length=150)
     content = models.TextField()
+    # Plain text preview of the content, for the feeds. Computed on save.
+    excerpt = models.CharField(
+        max_length=EXCERPT_LENGTH, blank=True, default="", editable=False
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # Back the cursor pagination, optionally filtered by the lecture or the writer.
+        indexes = (
+            models.Index(fields=("-created_at",), name="agora_story_created_idx"),
+            models.Index(fields=("-updated_at",), name="agora_story_updated_idx"),
+            models.Index(
+                fields=("lecture", "-created_at"), name="agora_story_lect_created_idx"
+            ),
+            models.Index(
+                fields=("writer", "-created_at"), name="agora_story_writer_created_idx"
+            ),
+        )
+
+    def save(self, *args, **kwargs):
+        self.excerpt = make_excerpt(self.content)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "content" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "excerpt"}
+
+        super().save(*args, **kwargs)
+
 
 class Semester(models.Model):
     SEASON_CHOICES = (
@@ -61,3 +117,28 @@ class Semester(models.Model):
 
     def __str__(self):
         return f"{self.get_season_display()} {self.year}"
+
+
+class CatalogVersionManager(models.Manager):
+    def current(self):
+        return self.get_or_create(pk=1)[0].version
+
+    def bump(self):
+        """
+        Replace the version, in the current transaction if any,
+        so that other processes see it along with the changes.
+        """
+        if not self.filter(pk=1).update(version=uuid.uuid4()):
+            self.get_or_create(pk=1)
+
+
+class CatalogVersion(models.Model):
+    """
+    The version of the lecture catalog, a single row replaced on every change of
+    the lectures. Unlike the versions of the response cache, it is shared by all
+    the processes whatever the cache backend. See 'catalog.py'.
+    """
+
+    version = models.UUIDField(default=uuid.uuid4)
+
+    objects = CatalogVersionManager()
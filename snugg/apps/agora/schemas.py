@@ -1,21 +1,60 @@
-from drf_spectacular.utils import OpenApiResponse, extend_schema, extend_schema_view
+from drf_spectacular.utils import (
+    OpenApiParameter,
+    OpenApiResponse,
+    OpenApiTypes,
+    extend_schema,
+    extend_schema_view,
+)
 
-from .serializers import LectureSerializer, StorySerializer
+from .serializers import (
+    LectureAutocompleteSerializer,
+    LectureSerializer,
+    StorySerializer,
+)
+
+fields_parameter = OpenApiParameter(
+    name="fields", description="Return only the comma-seperated fields"
+)
+compact_parameter = OpenApiParameter(
+    name="compact",
+    type=OpenApiTypes.BOOL,
+    description="Return the excerpt of the content only",
+)
 
 lecture_viewset_schema = extend_schema_view(
     retrieve=extend_schema(
         summary="Retreive Agora Lecture",
         description="Retrieve a lecture from Agora.",
+        parameters=[fields_parameter],
         responses={
             200: OpenApiResponse(response=LectureSerializer),
             404: OpenApiResponse(description="Lecture for given id not found."),
         },
     ),
     list=extend_schema(
-        summary="List Agora Lectures", description="List lectures on Agora."
+        summary="List Agora Lectures",
+        description="List lectures on Agora.",
+        parameters=[fields_parameter],
     ),
 )
 
+lecture_autocomplete_view = extend_schema(
+    summary="Autocomplete Agora Lectures",
+    description="List the first lectures whose name or id starts with the given "
+    "prefix, with their ids only. Accepts the filters of the lecture list.",
+    parameters=[
+        OpenApiParameter(
+            name="prefix", description="Prefix of the lectures, while typing"
+        ),
+        OpenApiParameter(
+            name="limit",
+            type=OpenApiTypes.INT,
+            description="Number of the lectures, up to 50",
+        ),
+    ],
+    responses={200: OpenApiResponse(response=LectureAutocompleteSerializer(many=True))},
+)
+
 story_viewset_schema = extend_schema_view(
     create=extend_schema(
         summary="Create Agora Story",
@@ -31,6 +70,7 @@ story_viewset_schema = extend_schema_view(
     retrieve=extend_schema(
         summary="Retrieve Agora Story",
         description="Retrieve a story from Agora.",
+        parameters=[fields_parameter],
         responses={
             200: OpenApiResponse(response=StorySerializer),
             404: OpenApiResponse(description="Story for given id not found."),
@@ -39,6 +79,7 @@ story_viewset_schema = extend_schema_view(
     list=extend_schema(
         summary="List Agora Storys",
         description="List storys on Agora board.",
+        parameters=[fields_parameter, compact_parameter],
     ),
     update=extend_schema(
         summary="Update Agora Story",
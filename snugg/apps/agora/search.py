@@ -0,0 +1,83 @@
+import operator
+from functools import reduce
+
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import FloatField, Q, Value
+from django.db.models.functions import Greatest, Upper
+from rest_framework.filters import OrderingFilter, SearchFilter
+
+
+class TrigramSearchFilter(SearchFilter):
+    """
+    'SearchFilter' backed by the pg_trgm GIN indexes of the search fields,
+    which are columns of the model.
+
+    Every term must be contained in one of the fields, or be similar enough to
+    a word of it, so that typos are tolerated. Both are answered by the indexes
+    on 'UPPER(field)', the expression 'icontains' is compiled into.
+
+    Every queryset is annotated with 'search_rank', the word similarity of the
+    terms summed up, which 'TrigramOrderingFilter' ranks the results by.
+    """
+
+    rank_field = "search_rank"
+
+    def get_rank(self, search_terms, search_fields):
+        ranks = []
+        for term in search_terms:
+            similarities = [
+                TrigramWordSimilarity(term, field) for field in search_fields
+            ]
+            ranks.append(
+                Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+            )
+
+        return reduce(operator.add, ranks)
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+
+        if not search_fields or not search_terms:
+            return queryset.annotate(
+                **{self.rank_field: Value(0.0, output_field=FloatField())}
+            )
+
+        queryset = queryset.alias(
+            **{f"{field}_upper": Upper(field) for field in search_fields}
+        )
+        for term in search_terms:
+            queryset = queryset.filter(
+                reduce(
+                    operator.or_,
+                    (
+                        Q(**{f"{field}__icontains": term})
+                        | Q(**{f"{field}_upper__trigram_word_similar": term.upper()})
+                        for field in search_fields
+                    ),
+                )
+            )
+
+        return queryset.annotate(
+            **{self.rank_field: self.get_rank(search_terms, search_fields)}
+        )
+
+
+class TrigramOrderingFilter(OrderingFilter):
+    """
+    'OrderingFilter' ranking the results of 'TrigramSearchFilter' first, by
+    'search_rank', unless an ordering is given. Must come after it.
+    """
+
+    search_filter_class = TrigramSearchFilter
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if request.query_params.get(self.ordering_param):
+            return ordering
+
+        search_filter = self.search_filter_class()
+        if not search_filter.get_search_terms(request):
+            return ordering
+
+        return (f"-{search_filter.rank_field}", *(ordering or ()))
@@ -1,8 +1,12 @@
+from collections import defaultdict
+
 from rest_framework import serializers
 
 from snugg.apps.user.serializers import UserPublicSerializer
+from snugg.values import Related, ValuesSerializer
 
-from .models import Lecture, Story
+from .catalog import lecture_catalog
+from .models import Lecture, Semester, Story
 
 
 class LectureSerializer(serializers.ModelSerializer):
@@ -25,7 +29,17 @@ class LectureSerializer(serializers.ModelSerializer):
         )
 
 
+class LectureAutocompleteSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Lecture
+        fields = ("pk", "name", "lecture_id", "instructor")
+
+
 class LectureField(serializers.RelatedField):
+    """
+    The lecture, represented from the catalog snapshot by its primary key only.
+    """
+
     queryset = Lecture.objects.all()
 
     def to_internal_value(self, data):
@@ -38,8 +52,11 @@ class LectureField(serializers.RelatedField):
 
         return lecture
 
+    def use_pk_only_optimization(self):
+        return True
+
     def to_representation(self, value):
-        return LectureSerializer(value).data
+        return lecture_catalog.get(value.pk)
 
 
 class StorySerializer(serializers.ModelSerializer):
@@ -54,6 +71,7 @@ class StorySerializer(serializers.ModelSerializer):
             "writer",
             "title",
             "content",
+            "excerpt",
             "created_at",
             "updated_at",
         )
@@ -64,3 +82,33 @@ class StorySerializer(serializers.ModelSerializer):
         validated_data["writer"] = user
 
         return super().create(validated_data)
+
+
+def get_lecture_semesters(pks):
+    semesters = defaultdict(list)
+    items = (
+        Lecture.semesters.through.objects.filter(lecture_id__in=pks)
+        .order_by("-semester__year", "-semester__season")
+        .values_list("lecture_id", "semester__year", "semester__season")
+    )
+
+    # The few semesters are named once, not once per lecture.
+    names = {}
+    for lecture_id, year, season in items:
+        if (year, season) not in names:
+            names[year, season] = str(Semester(year=year, season=season))
+        semesters[lecture_id].append(names[year, season])
+
+    return semesters
+
+
+class LectureValuesSerializer(ValuesSerializer):
+    serializer_class = LectureSerializer
+    overrides = {"semesters": Related(get_lecture_semesters)}
+
+
+class StoryValuesSerializer(ValuesSerializer):
+    serializer_class = StorySerializer
+    overrides = {
+        "lecture": Related(lecture_catalog.get_many, default=dict, path="lecture"),
+    }
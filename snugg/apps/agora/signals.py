@@ -0,0 +1,26 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from snugg.apps.univ.models import College, Major, University
+from snugg.cache import response_cache
+
+from .catalog import CATALOG_NAMESPACE
+from .models import CatalogVersion, Lecture, Semester
+
+
+@receiver(post_save, sender=Lecture)
+@receiver(post_delete, sender=Lecture)
+@receiver(m2m_changed, sender=Lecture.semesters.through)
+@receiver(post_save, sender=Semester)
+@receiver(post_delete, sender=Semester)
+@receiver(post_save, sender=University)
+@receiver(post_delete, sender=University)
+@receiver(post_save, sender=College)
+@receiver(post_delete, sender=College)
+@receiver(post_save, sender=Major)
+@receiver(post_delete, sender=Major)
+def invalidate_lectures(sender, **kwargs):
+    # Lectures show the names of their university, college, major and semesters.
+    # The other processes see the new version of the catalog once committed.
+    CatalogVersion.objects.bump()
+    response_cache.invalidate_on_commit(CATALOG_NAMESPACE, "agora:lectures")
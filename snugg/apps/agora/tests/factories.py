@@ -0,0 +1,65 @@
+import factory
+from factory.django import DjangoModelFactory
+
+from snugg.apps.univ.models import College, Major, University
+from snugg.apps.user.tests import UserFactory
+
+from ..models import Lecture, Semester, Story
+
+
+class UniversityFactory(DjangoModelFactory):
+    class Meta:
+        model = University
+
+    name = factory.Sequence(lambda n: f"University {n}")
+
+
+class CollegeFactory(DjangoModelFactory):
+    class Meta:
+        model = College
+
+    university = factory.SubFactory(UniversityFactory)
+    name = factory.Sequence(lambda n: f"College {n}")
+
+
+class MajorFactory(DjangoModelFactory):
+    class Meta:
+        model = Major
+
+    college = factory.SubFactory(CollegeFactory)
+    university = factory.SelfAttribute("college.university")
+    name = factory.Sequence(lambda n: f"Major {n}")
+
+
+class LectureFactory(DjangoModelFactory):
+    class Meta:
+        model = Lecture
+
+    name = factory.Sequence(lambda n: f"Lecture {n}")
+    lecture_id = factory.Sequence(lambda n: f"L{n:05}")
+    instructor = factory.Faker("name")
+    university = factory.SubFactory(UniversityFactory)
+
+    @factory.post_generation
+    def semesters(self, create, extracted):
+        if create and extracted:
+            self.semesters.add(*extracted)
+
+
+class SemesterFactory(DjangoModelFactory):
+    class Meta:
+        model = Semester
+        django_get_or_create = ("year", "season")
+
+    year = 2022
+    season = 2
+
+
+class StoryFactory(DjangoModelFactory):
+    class Meta:
+        model = Story
+
+    lecture = factory.SubFactory(LectureFactory)
+    writer = factory.SubFactory(UserFactory)
+    title = factory.Faker("sentence", nb_words=4)
+    content = factory.Faker("text")
@@ -0,0 +1,18 @@
+import tempfile
+
+
+class TemporaryCatalogMixin:
+    """
+    Build the lecture catalog into a temporary directory of the test,
+    rather than into the one shared with the running servers.
+    """
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.catalog_directory = directory.name
+
+        settings = self.settings(AGORA_CATALOG_DIR=directory.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
@@ -0,0 +1,82 @@
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .factories import LectureFactory
+
+
+class LectureAutocompleteTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.linear_algebra = LectureFactory(name="Linear Algebra", lecture_id="MATH101")
+        cls.linguistics = LectureFactory(name="Linguistics", lecture_id="LING201")
+        cls.calculus = LectureFactory(name="Calculus", lecture_id="MATH102")
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, **params):
+        return self.client.get(reverse("agora-lecture-autocomplete"), params)
+
+    def get_names(self, **params):
+        response = self.get(**params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        return [lecture["name"] for lecture in response.data]
+
+    def test_autocomplete(self):
+        response = self.get(prefix="lin")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            [
+                {
+                    "pk": lecture.pk,
+                    "name": lecture.name,
+                    "lecture_id": lecture.lecture_id,
+                    "instructor": lecture.instructor,
+                }
+                for lecture in (self.linear_algebra, self.linguistics)
+            ],
+        )
+        # By the lecture id as well, case-insensitively.
+        self.assertEqual(self.get_names(prefix="math"), ["Calculus", "Linear Algebra"])
+        # Prefixes only.
+        self.assertEqual(self.get_names(prefix="algebra"), [])
+
+    def test_autocomplete_empty_prefix(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_names(prefix=" "), [])
+        self.assertEqual(self.get_names(), [])
+
+    def test_autocomplete_limit(self):
+        LectureFactory.create_batch(60, name="Linear Programming")
+
+        self.assertEqual(len(self.get_names(prefix="lin")), 10)
+        self.assertEqual(len(self.get_names(prefix="lin", limit=1)), 1)
+        self.assertEqual(len(self.get_names(prefix="lin", limit=100)), 50)
+
+        for limit in ("-1", "ten", "1.5", "²"):
+            response = self.get(prefix="lin", limit=limit)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_autocomplete_cache(self):
+        self.assertEqual(self.get(prefix="lin")["X-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get(prefix="lin")["X-Cache"], "HIT")
+
+        # For a minute only.
+        with mock.patch("time.time", return_value=time.time() + 61):
+            self.assertEqual(self.get(prefix="lin")["X-Cache"], "MISS")
+
+        # Until the lectures change.
+        self.assertEqual(self.get(prefix="lin")["X-Cache"], "HIT")
+        LectureFactory(name="Linear Programming")
+        response = self.get(prefix="lin")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(len(response.data), 3)
@@ -0,0 +1,134 @@
+import fcntl
+import os
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+
+from ..catalog import LectureCatalog, lecture_catalog
+from ..models import CatalogVersion, Lecture
+from ..serializers import LectureSerializer
+from .factories import LectureFactory, MajorFactory, SemesterFactory
+from .mixins import TemporaryCatalogMixin
+
+
+class LectureCatalogTests(TemporaryCatalogMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.major = MajorFactory()
+        cls.lectures = [
+            LectureFactory(
+                university=cls.major.university,
+                college=cls.major.college,
+                major=cls.major,
+                semesters=[SemesterFactory(), SemesterFactory(season=4)],
+            ),
+            LectureFactory(),
+        ]
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def represent(self, lecture):
+        lecture = Lecture.objects.get(pk=lecture.pk)
+        return LectureSerializer(lecture).data
+
+    def test_get_many(self):
+        pks = [lecture.pk for lecture in self.lectures]
+        expected = {lecture.pk: self.represent(lecture) for lecture in self.lectures}
+
+        self.assertEqual(lecture_catalog.get_many(pks), expected)
+        with self.assertNumQueries(0):
+            self.assertEqual(lecture_catalog.get_many(pks), expected)
+            self.assertEqual(lecture_catalog.get_many([]), {})
+
+    def test_get_many_missing(self):
+        snapshot = lecture_catalog.get_snapshot()
+        # Without any signal, as if created while the snapshot was being built.
+        [lecture] = Lecture.objects.bulk_create(
+            [Lecture(name="Missing", lecture_id="M1", instructor="Kim")]
+        )
+        pks = [self.lectures[0].pk, lecture.pk, 0]
+
+        lectures = lecture_catalog.get_many(pks)
+
+        self.assertIs(lecture_catalog.get_snapshot(), snapshot)
+        self.assertEqual(set(lectures), {self.lectures[0].pk, lecture.pk})
+        self.assertEqual(lectures[lecture.pk], self.represent(lecture))
+        self.assertIsNone(lecture_catalog.get(0))
+
+    def test_rebuild(self):
+        lecture = self.lectures[0]
+        snapshot = lecture_catalog.get_snapshot()
+
+        lecture.name = "Renamed"
+        lecture.save()
+        self.assertEqual(lecture_catalog.get(lecture.pk)["name"], "Renamed")
+
+        self.major.name = "Renamed"
+        self.major.save()
+        self.assertEqual(lecture_catalog.get(lecture.pk)["major"], "Renamed")
+
+        lecture.semesters.clear()
+        self.assertEqual(lecture_catalog.get(lecture.pk)["semesters"], [])
+
+        self.assertIsNot(lecture_catalog.get_snapshot(), snapshot)
+
+    def test_rebuild_other_process(self):
+        lecture = self.lectures[0]
+        now = time.monotonic()
+
+        with mock.patch("time.monotonic", return_value=now):
+            lecture_catalog.get_snapshot()
+
+            # Changed by another process, which invalidated its own cache only.
+            Lecture.objects.filter(pk=lecture.pk).update(name="Renamed")
+            CatalogVersion.objects.bump()
+
+            self.assertEqual(lecture_catalog.get(lecture.pk)["name"], lecture.name)
+
+        later = now + lecture_catalog.check_interval
+        with mock.patch("time.monotonic", return_value=later):
+            self.assertEqual(lecture_catalog.get(lecture.pk)["name"], "Renamed")
+
+    def test_remove_old(self):
+        catalog = LectureCatalog()
+        snapshots = []
+        for version in ("first", "second", "third"):
+            snapshots.append(catalog.load(version))
+            path = os.path.join(self.catalog_directory, f"lectures-{version}.catalog")
+            os.utime(path, (len(snapshots), len(snapshots)))
+
+        # The previous version is kept for the processes still loading it.
+        self.assertEqual(
+            set(os.listdir(self.catalog_directory)),
+            {"build.lock", "lectures-second.catalog", "lectures-third.catalog"},
+        )
+        # Removed files stay mapped.
+        lecture = self.lectures[0]
+        self.assertEqual(snapshots[0].get(lecture.pk), self.represent(lecture))
+
+    def test_load_removed(self):
+        catalog = LectureCatalog()
+        catalog.load("first")
+        os.remove(os.path.join(self.catalog_directory, "lectures-first.catalog"))
+
+        snapshot = catalog.load("first")
+
+        self.assertEqual(len(snapshot), len(self.lectures))
+
+    def test_load_while_building(self):
+        lecture = self.lectures[0]
+        snapshot = lecture_catalog.get_snapshot()
+        lecture.name = "Renamed"
+        lecture.save()
+
+        # Another process is building the new version.
+        path = os.path.join(self.catalog_directory, "build.lock")
+        with open(path, "wb") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            self.assertIs(lecture_catalog.get_snapshot(), snapshot)
+
+        self.assertEqual(lecture_catalog.get(lecture.pk)["name"], "Renamed")
@@ -0,0 +1,260 @@
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+import orjson
+from django.core.cache import cache
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+
+from ..catalog import lecture_catalog
+from ..models import CatalogVersion, Lecture, Semester
+from .factories import LectureFactory, MajorFactory, SemesterFactory
+from .mixins import TemporaryCatalogMixin
+
+CSV_HEADER = "lecture_id,name,instructor,university,college,major,semesters\n"
+
+
+class ImportLecturesTests(TemporaryCatalogMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.major = MajorFactory(name="Mathematics")
+        cls.college = cls.major.college
+        cls.university = cls.major.university
+        cls.spring = SemesterFactory(year=2022, season=2)
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def import_lectures(self, content, suffix="csv", **options):
+        path = os.path.join(self.directory, f"lectures.{suffix}")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+
+        stdout, stderr = StringIO(), StringIO()
+        call_command("import_lectures", path, stdout=stdout, stderr=stderr, **options)
+
+        return stdout.getvalue(), stderr.getvalue()
+
+    def make_csv(self, *rows):
+        return CSV_HEADER + "".join(f"{','.join(row)}\n" for row in rows)
+
+    def make_row(self, lecture_id, name, semesters="Spring 2022"):
+        return (
+            lecture_id,
+            name,
+            "Kim",
+            self.university.name,
+            self.college.name,
+            self.major.name,
+            semesters,
+        )
+
+    def test_import_csv(self):
+        stdout, stderr = self.import_lectures(
+            self.make_csv(
+                self.make_row("MATH101", "Calculus", "Spring 2022;Fall 2022"),
+                (
+                    "MATH102",
+                    "Linear Algebra",
+                    "Lee",
+                    self.university.name,
+                    "",
+                    "",
+                    "",
+                ),
+            )
+        )
+
+        self.assertIn("2 created, 0 updated, 0 unchanged, 2 linked, 0 skipped", stdout)
+        self.assertEqual(stderr, "")
+        calculus = Lecture.objects.get(lecture_id="MATH101")
+        self.assertEqual(
+            (calculus.name, calculus.instructor, calculus.university, calculus.major),
+            ("Calculus", "Kim", self.university, self.major),
+        )
+        self.assertEqual(
+            {str(semester) for semester in calculus.semesters.all()},
+            {"Spring 2022", "Fall 2022"},
+        )
+        algebra = Lecture.objects.get(lecture_id="MATH102")
+        self.assertEqual((algebra.college, algebra.major), (None, None))
+        self.assertFalse(algebra.semesters.exists())
+
+    def test_import_jsonl(self):
+        records = [
+            {
+                "lecture_id": "MATH101",
+                "name": "Calculus",
+                "instructor": "Kim",
+                "university": self.university.name,
+                "college": self.college.name,
+                "major": self.major.name,
+                "semesters": ["Spring 2022", "Fall 2022"],
+            },
+            {
+                "lecture_id": "MATH102",
+                "name": "Linear Algebra",
+                "instructor": "Lee",
+                "university": self.university.name,
+            },
+        ]
+
+        stdout, _ = self.import_lectures(
+            "\n".join(orjson.dumps(record).decode() for record in records),
+            suffix="jsonl",
+        )
+
+        self.assertIn("2 created, 0 updated, 0 unchanged, 2 linked, 0 skipped", stdout)
+        calculus = Lecture.objects.get(lecture_id="MATH101")
+        self.assertEqual(calculus.major, self.major)
+        self.assertEqual(calculus.semesters.count(), 2)
+        self.assertTrue(Lecture.objects.filter(lecture_id="MATH102").exists())
+
+    def test_reimport(self):
+        lecture = LectureFactory(
+            lecture_id="MATH101",
+            name="Calculus",
+            instructor="Kim",
+            university=self.university,
+            college=self.college,
+            major=self.major,
+            semesters=[self.spring],
+        )
+        content = self.make_csv(
+            self.make_row("MATH101", "Calculus"),
+            self.make_row("MATH102", "Linear Algebra"),
+        )
+
+        stdout, _ = self.import_lectures(content)
+        self.assertIn("1 created, 0 updated, 1 unchanged, 1 linked", stdout)
+
+        stdout, _ = self.import_lectures(content)
+        self.assertIn("0 created, 0 updated, 2 unchanged, 0 linked", stdout)
+
+        stdout, _ = self.import_lectures(
+            self.make_csv(self.make_row("MATH101", "Calculus I", "Fall 2022"))
+        )
+        self.assertIn("0 created, 1 updated, 0 unchanged, 1 linked", stdout)
+        lecture.refresh_from_db()
+        self.assertEqual(lecture.name, "Calculus I")
+        # Semesters are only added.
+        self.assertEqual(lecture.semesters.count(), 2)
+        self.assertEqual(Lecture.objects.count(), 2)
+
+    def test_import_skipped(self):
+        stdout, stderr = self.import_lectures(
+            self.make_csv(
+                self.make_row("MATH101", ""),
+                self.make_row("MATH102", "Calculus", "Someday 2022"),
+                ("MATH103", "Calculus", "Kim", "Nowhere", "", "", ""),
+                (
+                    "MATH104",
+                    "Calculus",
+                    "Kim",
+                    self.university.name,
+                    "Nowhere",
+                    "",
+                    "",
+                ),
+                self.make_row("MATH105", "Calculus"),
+            )
+        )
+
+        self.assertIn("1 created, 0 updated, 0 unchanged, 1 linked, 4 skipped", stdout)
+        self.assertEqual(
+            stderr.splitlines(),
+            [
+                "Skipped row 1: name must have 1 to 35 characters.",
+                "Skipped row 2: Unknown semester 'Someday 2022'.",
+                "Skipped row 3: Unknown university 'Nowhere'.",
+                "Skipped row 4: Unknown college 'Nowhere'.",
+            ],
+        )
+        self.assertEqual(
+            list(Lecture.objects.values_list("lecture_id", flat=True)), ["MATH105"]
+        )
+
+    def test_import_jsonl_skipped(self):
+        record = {
+            "lecture_id": "MATH101",
+            "name": "Calculus",
+            "instructor": "Kim",
+            "university": self.university.name,
+        }
+        lines = [
+            '{"lecture_id": ',
+            "[]",
+            orjson.dumps({**record, "lecture_id": 101}).decode(),
+            orjson.dumps({**record, "university": ["Nowhere"]}).decode(),
+            orjson.dumps({**record, "semesters": ["Spring 2022", 2022]}).decode(),
+            orjson.dumps({**record, "semesters": {"Spring": 2022}}).decode(),
+            "",
+            orjson.dumps(record).decode(),
+        ]
+
+        stdout, stderr = self.import_lectures("\n".join(lines), suffix="jsonl")
+
+        self.assertIn("1 created, 0 updated, 0 unchanged, 0 linked, 6 skipped", stdout)
+        errors = stderr.splitlines()
+        self.assertEqual(
+            [error.split(":")[0] for error in errors],
+            [f"Skipped row {number}" for number in range(1, 7)],
+        )
+        self.assertIn("Invalid JSON", errors[0])
+        self.assertEqual(
+            errors[1:],
+            [
+                "Skipped row 2: Not a JSON object.",
+                "Skipped row 3: lecture_id must be a string.",
+                "Skipped row 4: university must be a string.",
+                "Skipped row 5: semesters must be a list of names.",
+                "Skipped row 6: semesters must be a list of names.",
+            ],
+        )
+        self.assertTrue(Lecture.objects.filter(lecture_id="MATH101").exists())
+
+    def test_import_semesters_created(self):
+        self.import_lectures(
+            self.make_csv(
+                self.make_row("MATH101", "Calculus", "Winter 2030;Spring 2022"),
+                self.make_row("MATH102", "Linear Algebra", "Winter 2030"),
+            )
+        )
+
+        winter = Semester.objects.get(year=2030, season=1)
+        self.assertEqual(Semester.objects.count(), 2)
+        self.assertEqual(
+            set(winter.lectures.values_list("lecture_id", flat=True)),
+            {"MATH101", "MATH102"},
+        )
+
+    def test_import_invalidates_catalog(self):
+        lecture = LectureFactory(
+            lecture_id="MATH101", name="Calculus", university=self.university
+        )
+        self.assertEqual(lecture_catalog.get(lecture.pk)["name"], "Calculus")
+        version = CatalogVersion.objects.current()
+
+        self.import_lectures(self.make_csv(self.make_row("MATH101", "Calculus I")))
+
+        self.assertNotEqual(CatalogVersion.objects.current(), version)
+        self.assertEqual(lecture_catalog.get(lecture.pk)["name"], "Calculus I")
+
+    def test_import_invalidates_catalog_once(self):
+        content = self.make_csv(
+            *(self.make_row(f"MATH10{number}", "Calculus") for number in range(3))
+        )
+
+        with mock.patch.object(
+            CatalogVersion.objects, "bump", wraps=CatalogVersion.objects.bump
+        ) as bump:
+            stdout, _ = self.import_lectures(content, batch_size=1)
+
+        self.assertIn("3 created", stdout)
+        bump.assert_called_once_with()
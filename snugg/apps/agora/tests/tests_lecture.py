@@ -0,0 +1,97 @@
+from django.core.cache import cache
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .factories import CollegeFactory, LectureFactory, MajorFactory
+from .mixins import TemporaryCatalogMixin
+
+
+def has_trigram_extension():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+class LectureListTests(TemporaryCatalogMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.major = MajorFactory()
+        cls.college = cls.major.college
+        cls.university = cls.major.university
+        cls.linear_algebra = LectureFactory(
+            name="Linear Algebra",
+            instructor="Kim",
+            university=cls.university,
+            college=cls.college,
+            major=cls.major,
+        )
+        cls.topology = LectureFactory(
+            name="Algebraic Topology",
+            instructor="Lee",
+            university=cls.university,
+            college=cls.college,
+        )
+        cls.chemistry = LectureFactory(name="Organic Chemistry", instructor="Park")
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def get_names(self, **params):
+        response = self.client.get(reverse("agora-lecture-list"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        return [lecture["name"] for lecture in response.data["results"]]
+
+    def test_lecture_list(self):
+        self.assertEqual(
+            self.get_names(),
+            ["Algebraic Topology", "Linear Algebra", "Organic Chemistry"],
+        )
+
+    def test_lecture_search(self):
+        if not has_trigram_extension():
+            self.skipTest("pg_trgm is not installed.")
+
+        # Both are similar enough to the typo, the closest first.
+        self.assertEqual(
+            self.get_names(search="algebrra"), ["Linear Algebra", "Algebraic Topology"]
+        )
+        self.assertEqual(
+            self.get_names(search="algebrra", ordering="name"),
+            ["Algebraic Topology", "Linear Algebra"],
+        )
+        self.assertEqual(self.get_names(search="chemistry"), ["Organic Chemistry"])
+
+    def test_lecture_ordering_search_rank(self):
+        # Every lecture ranks the same without any search.
+        self.assertEqual(
+            self.get_names(ordering="-search_rank,name"),
+            ["Algebraic Topology", "Linear Algebra", "Organic Chemistry"],
+        )
+
+        if not has_trigram_extension():
+            return
+
+        self.assertEqual(
+            self.get_names(search="algebrra", ordering="search_rank"),
+            ["Algebraic Topology", "Linear Algebra"],
+        )
+
+    def test_lecture_filter(self):
+        other_major = MajorFactory(college=self.college)
+        LectureFactory(name="Set Theory", university=self.university, major=other_major)
+
+        self.assertEqual(
+            self.get_names(university=self.university.pk),
+            ["Algebraic Topology", "Linear Algebra", "Set Theory"],
+        )
+        self.assertEqual(
+            self.get_names(college=self.college.pk),
+            ["Algebraic Topology", "Linear Algebra"],
+        )
+        self.assertEqual(self.get_names(major=self.major.pk), ["Linear Algebra"])
+        self.assertEqual(self.get_names(major=other_major.pk), ["Set Theory"])
+        self.assertEqual(self.get_names(college=CollegeFactory().pk), [])
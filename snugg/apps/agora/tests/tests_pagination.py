@@ -0,0 +1,122 @@
+from base64 import b64encode
+from unittest import mock
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from snugg.pagination import EstimatedCountPaginator
+
+from .factories import LectureFactory, UniversityFactory
+from .mixins import TemporaryCatalogMixin
+
+
+def encode_cursor(**tokens):
+    return b64encode(urlencode(tokens).encode()).decode()
+
+
+class LecturePaginationTests(TemporaryCatalogMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        names = ("Calculus", "선형대수", "Calculus", "Algebra", "Calculus", "Biology")
+        cls.university = UniversityFactory()
+        cls.lectures = [
+            LectureFactory(name=name, university=cls.university)
+            if name == "Calculus"
+            else LectureFactory(name=name)
+            for name in names
+        ]
+        cls.ordered = sorted(
+            ((lecture.name, lecture.pk) for lecture in cls.lectures),
+        )
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def get(self, url=None, **params):
+        response = self.client.get(url or reverse("agora-lecture-list"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        return response
+
+    def get_keys(self, response):
+        return [
+            (lecture["name"], lecture["pk"]) for lecture in response.data["results"]
+        ]
+
+    def test_keyset_pages(self):
+        # Ordered by name and pk, whatever the ordering.
+        response = self.get(cursor="", page_size=2, ordering="-name")
+        self.assertNotIn("count", response.data)
+        self.assertIsNone(response.data["previous"])
+
+        pages = [self.get_keys(response)]
+        while response.data["next"]:
+            response = self.get(response.data["next"])
+            pages.append(self.get_keys(response))
+
+        # The ties on 'Calculus' are split between the pages.
+        self.assertEqual(pages, [self.ordered[:2], self.ordered[2:4], self.ordered[4:]])
+
+        backwards = [self.get_keys(response)]
+        while response.data["previous"]:
+            response = self.get(response.data["previous"])
+            backwards.append(self.get_keys(response))
+
+        self.assertEqual(backwards, pages[::-1])
+
+    def test_keyset_filtered(self):
+        response = self.get(cursor="", page_size=1, university=self.university.pk)
+        response = self.get(response.data["next"])
+
+        self.assertEqual(
+            self.get_keys(response),
+            [key for key in self.ordered if key[0] == "Calculus"][1:2],
+        )
+
+    def test_keyset_invalid_cursor(self):
+        url = reverse("agora-lecture-list")
+        cursors = (
+            "invalid",
+            encode_cursor(p="invalid"),
+            encode_cursor(p='"Calculus"'),
+            encode_cursor(p='["Calculus"]'),
+            encode_cursor(p='["Calculus", "invalid"]'),
+            encode_cursor(p="[null, 1]"),
+        )
+
+        for cursor in cursors:
+            response = self.client.get(url, {"cursor": cursor})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, cursor)
+
+    def test_estimated_count(self):
+        # Few lectures are counted exactly.
+        response = self.get(count="estimated", page_size=4)
+        self.assertEqual(response.data["count"], len(self.lectures))
+        self.assertEqual(self.get_keys(response), self.ordered[:4])
+        self.assertIsNotNone(response.data["next"])
+
+        with mock.patch.object(EstimatedCountPaginator, "exact_count_threshold", 0):
+            with CaptureQueriesContext(connection) as context:
+                response = self.get(count="estimated", page_size=4)
+            self.assertFalse(
+                any("COUNT(" in query["sql"] for query in context.captured_queries)
+            )
+            self.assertIsNotNone(response.data["next"])
+
+            # The last page tells the exact count.
+            response = self.get(response.data["next"])
+            self.assertEqual(response.data["count"], len(self.lectures))
+            self.assertEqual(self.get_keys(response), self.ordered[4:])
+            self.assertIsNone(response.data["next"])
+
+            response = self.client.get(
+                reverse("agora-lecture-list"),
+                {"count": "estimated", "page_size": 4, "page": 3},
+            )
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
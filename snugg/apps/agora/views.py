@@ -1,57 +1,199 @@
+from django.db.models import Q
 from django_filters import rest_framework as filters
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.filters import OrderingFilter, SearchFilter
 from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
 
+from snugg.cache import cached_response
+from snugg.mixins import (
+    ConditionalGetMixin,
+    LimitMixin,
+    SparseFieldsMixin,
+    StreamingListMixin,
+    ValuesListMixin,
+)
+from snugg.pagination import EstimatedCountPaginator, KeysetPagination
+
+from .catalog import lecture_catalog
 from .models import Lecture, Story
-from .schemas import lecture_viewset_schema, story_viewset_schema
-from .serializers import LectureSerializer, StorySerializer
+from .schemas import (
+    lecture_autocomplete_view,
+    lecture_viewset_schema,
+    story_viewset_schema,
+)
+from .search import TrigramOrderingFilter, TrigramSearchFilter
+from .serializers import (
+    LectureAutocompleteSerializer,
+    LectureSerializer,
+    StorySerializer,
+    StoryValuesSerializer,
+)
 
 
 class LectureFilter(filters.FilterSet):
-    university = filters.CharFilter(
+    # By the ids, not to join the tables.
+    university = filters.NumberFilter(field_name="university")
+    college = filters.NumberFilter(field_name="college")
+    major = filters.NumberFilter(field_name="major")
+    university_name = filters.CharFilter(
         field_name="university__name", lookup_expr="icontains"
     )
-    college = filters.CharFilter(field_name="college__name", lookup_expr="icontains")
-    major = filters.CharFilter(field_name="major__name", lookup_expr="icontains")
+    college_name = filters.CharFilter(
+        field_name="college__name", lookup_expr="icontains"
+    )
+    major_name = filters.CharFilter(field_name="major__name", lookup_expr="icontains")
     year = filters.NumberFilter(field_name="semesters__year", distinct=True)
     season = filters.NumberFilter(field_name="semesters__season", distinct=True)
 
 
+class LectureKeysetPagination(KeysetPagination):
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("name", "pk")
+
+
 class LecturePagination(PageNumberPagination):
+    """
+    Numbered pages, counted exactly, or from the estimate of the query planner
+    with '?count=estimated'. Given a 'cursor', even empty to start with,
+    keyset pages ordered by name instead, which are never counted.
+    """
+
     page_size = 10
     page_size_query_param = "page_size"
+    max_page_size = 100
+    count_query_param = "count"
+    keyset_pagination_class = LectureKeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.keyset_pagination_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_pagination_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+
+        if request.query_params.get(self.count_query_param) == "estimated":
+            self.django_paginator_class = EstimatedCountPaginator
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+
+        return super().get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            *super().get_schema_operation_parameters(view),
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "'estimated' to count the lectures approximately.",
+                "schema": {"type": "string", "enum": ["estimated"]},
+            },
+            {
+                "name": self.keyset_pagination_class.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value, empty for the first "
+                "page. The pages are then neither numbered nor counted.",
+                "schema": {"type": "string"},
+            },
+        ]
 
 
 @lecture_viewset_schema
-class LectureViewSet(ReadOnlyModelViewSet):
-    queryset = Lecture.objects.select_related(
-        "university", "college", "major"
-    ).prefetch_related("semesters")
+class LectureViewSet(
+    LimitMixin, SparseFieldsMixin, StreamingListMixin, ReadOnlyModelViewSet
+):
+    # Only filtered and paginated here, the lectures are read from the catalog.
+    queryset = Lecture.objects.only("pk", "name")
     serializer_class = LectureSerializer
     filter_backends = (
-        OrderingFilter,
-        SearchFilter,
+        TrigramSearchFilter,
+        TrigramOrderingFilter,
         filters.DjangoFilterBackend,
     )
     filterset_class = LectureFilter
-    ordering_fields = ("name",)
-    ordering = "name"
+    ordering_fields = ("name", "search_rank")
+    ordering = ("name", "pk")
     search_fields = ("name", "lecture_id", "instructor")
     pagination_class = LecturePagination
 
+    def trim_representation(self, data):
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return data
+
+        return {name: value for name, value in data.items() if name in fields}
+
+    def iter_representation(self, objects):
+        # Looked up at once, before the response may be streamed.
+        lectures = lecture_catalog.get_many([lecture.pk for lecture in objects])
+
+        return (
+            self.trim_representation(lectures[lecture.pk])
+            for lecture in objects
+            if lecture.pk in lectures
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        lecture = self.get_object()
+        data = lecture_catalog.get(lecture.pk)
+        if data is None:
+            raise NotFound
+
+        return Response(self.trim_representation(data))
+
+    @lecture_autocomplete_view
+    @action(
+        detail=False,
+        methods=["GET"],
+        serializer_class=LectureAutocompleteSerializer,
+        filter_backends=(filters.DjangoFilterBackend,),
+        pagination_class=None,
+    )
+    # Hot prefixes are typed by many users at once, but only for a while.
+    @cached_response("agora:lectures", timeout=60)
+    def autocomplete(self, request):
+        """
+        The first lectures whose name or id starts with the given 'prefix',
+        while typing. Neither counted nor joined, unlike the list.
+        """
+        prefix = request.query_params.get("prefix", "").strip()
+        if not prefix:
+            return Response([])
+
+        queryset = (
+            self.filter_queryset(Lecture.objects.all())
+            .filter(Q(name__istartswith=prefix) | Q(lecture_id__istartswith=prefix))
+            .order_by("name", "lecture_id", "pk")
+            .values(*LectureAutocompleteSerializer.Meta.fields)
+        )
+        serializer = self.get_serializer(queryset[: self.get_limit()], many=True)
+
+        return Response(serializer.data)
+
 
 class StoryPagination(CursorPagination):
     page_size = 10
     page_size_query_param = "page_size"
+    max_page_size = 100
 
 
 @story_viewset_schema
-class StoryViewSet(ModelViewSet):
-    queryset = Story.objects.select_related(
-        "lecture", "writer", "lecture__university", "lecture__college", "lecture__major"
-    ).prefetch_related("lecture__semesters")
+class StoryViewSet(
+    ConditionalGetMixin, SparseFieldsMixin, ValuesListMixin, ModelViewSet
+):
+    # The lectures are read from the catalog.
+    queryset = Story.objects.select_related("writer")
     serializer_class = StorySerializer
+    values_serializer_class = StoryValuesSerializer
     filter_backends = (
         OrderingFilter,
         SearchFilter,
@@ -71,3 +213,5 @@ class StoryViewSet(ModelViewSet):
         "content",
     )
     pagination_class = StoryPagination
+    deferrable_fields = ("content",)
+    compact_excluded_fields = ("content",)
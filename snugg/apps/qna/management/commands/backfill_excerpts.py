@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from snugg.apps.agora.models import Story
+from snugg.apps.qna.models import Post
+from snugg.cache import response_cache
+from snugg.excerpts import make_excerpt
+
+
+class Command(BaseCommand):
+    help = (
+        "Compute the excerpts of the QNA posts and the Agora stories saved before "
+        "they had one, chunk by chunk."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--all", action="store_true", help="Recompute the existing excerpts too."
+        )
+
+    def handle(self, *args, **options):
+        for model in (Post, Story):
+            count = self.backfill(model, options["chunk_size"], options["all"])
+            self.stdout.write(
+                self.style.SUCCESS(f"Updated {count} excerpts of {model.__name__}.")
+            )
+
+        response_cache.invalidate("qna:posts")
+
+    def backfill(self, model, chunk_size, recompute):
+        queryset = model.objects.only("pk", "content", "excerpt").order_by("pk")
+        if not recompute:
+            queryset = queryset.filter(excerpt="")
+
+        last_pk = 0
+        count = 0
+
+        while True:
+            chunk = list(queryset.filter(pk__gt=last_pk)[:chunk_size])
+            if not chunk:
+                break
+
+            changed = []
+            for obj in chunk:
+                excerpt = make_excerpt(obj.content)
+                if excerpt != obj.excerpt:
+                    obj.excerpt = excerpt
+                    changed.append(obj)
+
+            # Each chunk is committed on its own, not to lock all the rows at once.
+            # 'updated_at' is left untouched, the content being the same.
+            with transaction.atomic():
+                model.objects.bulk_update(changed, ["excerpt"])
+
+            if model is Post:
+                response_cache.invalidate(*(f"qna:post:{obj.pk}" for obj in changed))
+
+            count += len(changed)
+            last_pk = chunk[-1].pk
+
+        return count
@@ -0,0 +1,153 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max
+from rest_framework.pagination import Cursor
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from snugg.apps.qna.models import Comment, Field, Post
+from snugg.apps.qna.views import CommentPagination, PostPagination
+
+User = get_user_model()
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the cursor pagination of the QNA posts and comments at growing depths. "
+        "The rows are generated within a transaction which is always rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        self.rows = options["rows"]
+        self.repeat = options["repeat"]
+        self.batch_size = options["batch_size"]
+
+        try:
+            with transaction.atomic():
+                self.generate()
+                self.benchmark()
+                raise Rollback()
+        except Rollback:
+            pass
+
+    def generate(self):
+        self.stdout.write(f"Generating {self.rows} posts and comments...")
+
+        writer = User.objects.create_user("bench", "bench@snugg.invalid", None)
+        field = Field.objects.create(name="bench")
+        self.post = Post.objects.create(writer=writer, field=field, title="bench")
+        self.writer, self.field = writer, field
+
+        last_pks = {
+            model: model.objects.aggregate(last_pk=Max("pk"))["last_pk"] or 0
+            for model in (Post, Comment)
+        }
+
+        # Created through the models, so that every column gets its default.
+        # Every tenth post belongs to the writer and the field.
+        Post.objects.bulk_create(
+            (
+                Post(
+                    title=f"title {i}",
+                    content=f"content {i}",
+                    writer=writer if i % 10 == 0 else None,
+                    field=field if i % 10 == 0 else None,
+                )
+                for i in range(1, self.rows + 1)
+            ),
+            batch_size=self.batch_size,
+        )
+        # Every tenth comment belongs to the same post.
+        Comment.objects.bulk_create(
+            (
+                Comment(
+                    content=f"comment {i}",
+                    content_type=ContentType.objects.get_for_model(Post),
+                    object_id=self.post.pk if i % 10 == 0 else i,
+                )
+                for i in range(1, self.rows + 1)
+            ),
+            batch_size=self.batch_size,
+        )
+
+        with connection.cursor() as cursor:
+            # One second apart, the latest rows first, unlike 'auto_now_add'.
+            for model in (Post, Comment):
+                cursor.execute(
+                    f"""
+                    UPDATE {model._meta.db_table}
+                    SET created_at = now() - id * interval '1 second',
+                        updated_at = now() - id * interval '1 second'
+                    WHERE id > %s
+                    """,
+                    [last_pks[model]],
+                )
+            cursor.execute(f"ANALYZE {Post._meta.db_table}, {Comment._meta.db_table}")
+
+    def benchmark(self):
+        cases = (
+            ("posts", PostPagination, Post.objects.all()),
+            (
+                "posts by writer",
+                PostPagination,
+                Post.objects.filter(writer=self.writer),
+            ),
+            ("posts by field", PostPagination, Post.objects.filter(field=self.field)),
+            (
+                "comments of a post",
+                CommentPagination,
+                Comment.objects.filter(
+                    content_type=ContentType.objects.get_for_model(Post),
+                    object_id=self.post.pk,
+                ),
+            ),
+        )
+
+        for name, pagination_class, queryset in cases:
+            queryset = queryset.order_by("-created_at")
+            total = queryset.count()
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{name} ({total} rows)"))
+
+            depth = 0
+            while depth < total:
+                elapsed = self.measure(pagination_class, queryset, depth)
+                self.stdout.write(f"  depth {depth:>9}: {elapsed * 1000:8.2f} ms")
+                depth = depth * 10 or 10
+
+    def measure(self, pagination_class, queryset, depth):
+        """
+        Fetch the page starting at the given depth, the same way a client
+        following the 'next' links would do, and return the best time.
+        """
+        paginator = pagination_class()
+        paginator.base_url = "/"
+        paginator.ordering = "-created_at"
+        position = queryset.values_list("created_at", flat=True)[depth]
+        cursor = Cursor(offset=0, reverse=False, position=str(position))
+        request = Request(
+            APIRequestFactory().get(
+                paginator.encode_cursor(cursor), HTTP_HOST=settings.ALLOWED_HOSTS[0]
+            )
+        )
+
+        timings = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            list(paginator.paginate_queryset(queryset, request))
+            timings.append(time.perf_counter() - start)
+
+        return min(timings)
@@ -0,0 +1,151 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from snugg.apps.agora.catalog import CATALOG_NAMESPACE
+from snugg.apps.agora.models import Lecture, Semester, Story
+from snugg.apps.agora.serializers import StorySerializer, StoryValuesSerializer
+from snugg.apps.qna.models import Answer, Field, Post
+from snugg.apps.qna.serializers import (
+    AnswerSerializer,
+    AnswerValuesSerializer,
+    PostSerializer,
+    PostValuesSerializer,
+)
+from snugg.apps.univ.models import University
+from snugg.cache import response_cache
+
+User = get_user_model()
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the model serializers with the values serializers of the list "
+        "endpoints. The rows are generated within a transaction which is always "
+        "rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        self.rows = options["rows"]
+        self.repeat = options["repeat"]
+
+        try:
+            with transaction.atomic():
+                self.generate()
+                self.benchmark()
+                raise Rollback()
+        except Rollback:
+            # Not to keep the generated lecture in the catalog snapshot.
+            response_cache.invalidate(CATALOG_NAMESPACE)
+
+    def generate(self):
+        self.stdout.write(f"Generating {self.rows} posts, answers and stories...")
+
+        writers = [
+            User.objects.create_user(f"bench{i}", f"bench{i}@snugg.invalid", None)
+            for i in range(10)
+        ]
+        field = Field.objects.create(name="bench")
+        university = University.objects.create(name="bench")
+        lecture = Lecture.objects.create(
+            name="bench", lecture_id="bench", instructor="bench", university=university
+        )
+        lecture.semesters.add(*Semester.objects.bulk_create([Semester(year=1999)]))
+
+        posts = Post.objects.bulk_create(
+            Post(
+                writer=writers[i % 10],
+                field=field,
+                title=f"title {i}",
+                content=f"content {i}",
+            )
+            for i in range(self.rows)
+        )
+        for post in posts[:100]:
+            post.set_tags(["bench", f"tag{post.pk % 10}"])
+
+        Answer.objects.bulk_create(
+            Answer(post=posts[i], writer=writers[i % 10], content=f"content {i}")
+            for i in range(self.rows)
+        )
+        Story.objects.bulk_create(
+            Story(
+                lecture=lecture,
+                writer=writers[i % 10],
+                title=f"title {i}",
+                content=f"content {i}",
+            )
+            for i in range(self.rows)
+        )
+
+    def benchmark(self):
+        cases = (
+            (
+                "posts",
+                Post.objects.select_related("field", "writer").prefetch_related("tags"),
+                PostSerializer,
+                PostValuesSerializer,
+            ),
+            (
+                "answers",
+                Answer.objects.select_related("writer"),
+                AnswerSerializer,
+                AnswerValuesSerializer,
+            ),
+            (
+                "stories",
+                Story.objects.select_related("writer"),
+                StorySerializer,
+                StoryValuesSerializer,
+            ),
+        )
+
+        for name, queryset, serializer_class, values_serializer_class in cases:
+            queryset = queryset.order_by("pk")
+            values = queryset.prefetch_related(None).values(
+                *values_serializer_class.get_paths()
+            )
+
+            def serialize():
+                return serializer_class(list(queryset), many=True).data
+
+            def serialize_values():
+                return values_serializer_class.to_representation(values)
+
+            renderer = JSONRenderer()
+            same = renderer.render(serialize()) == renderer.render(serialize_values())
+
+            elapsed = self.measure(serialize)
+            values_elapsed = self.measure(serialize_values)
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{name} ({self.rows} rows)"))
+            self.stdout.write(f"  serializer:        {elapsed * 1000:8.1f} ms")
+            self.stdout.write(f"  values serializer: {values_elapsed * 1000:8.1f} ms")
+            self.stdout.write(f"  speedup:           {elapsed / values_elapsed:8.1f}x")
+            if same:
+                self.stdout.write(self.style.SUCCESS("  identical output"))
+            else:
+                self.stdout.write(self.style.ERROR("  different output"))
+
+    def measure(self, function):
+        """
+        Return the best time of querying and serializing all the rows.
+        """
+        timings = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+
+        return min(timings)
@@ -0,0 +1,44 @@
+from itertools import islice
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from snugg.apps.qna.models import Answer, Post, SearchTerm
+
+
+class Command(BaseCommand):
+    help = "Rebuild the n-gram inverted index of the QNA posts and answers."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument("--batch-size", type=int, default=10000)
+
+    def handle(self, *args, **options):
+        for model in (Post, Answer):
+            count = self.rebuild(model, options["chunk_size"], options["batch_size"])
+            self.stdout.write(
+                self.style.SUCCESS(f"Indexed {count} terms of {model.__name__}.")
+            )
+
+    def rebuild(self, model, chunk_size, batch_size):
+        content_type = ContentType.objects.get_for_model(model)
+        queryset = model.objects.only("pk", *model.search_weights).order_by("pk")
+        postings = (
+            SearchTerm(content_type=content_type, term=term, object_id=obj.pk)
+            for obj in queryset.iterator(chunk_size=chunk_size)
+            for term in obj.get_search_terms()
+        )
+        count = 0
+
+        with transaction.atomic():
+            SearchTerm.objects.filter(content_type=content_type).delete()
+            while True:
+                batch = list(islice(postings, batch_size))
+                if not batch:
+                    break
+
+                SearchTerm.objects.bulk_create(batch)
+                count += len(batch)
+
+        return count
@@ -0,0 +1,68 @@
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from snugg.apps.qna.models import Answer, Comment, Post
+
+
+def count_subquery(queryset, field):
+    return Coalesce(
+        Subquery(
+            queryset.order_by()
+            .values(field)
+            .annotate(count=Count("pk"))
+            .values("count")
+        ),
+        0,
+    )
+
+
+class Command(BaseCommand):
+    help = "Recompute the answer/comment counters of the QNA posts which drifted."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        content_type = ContentType.objects.get_for_model(Post)
+        actual_counts = {
+            "answer_count": count_subquery(
+                Answer.objects.filter(post=OuterRef("pk")), "post"
+            ),
+            "comment_count": count_subquery(
+                Comment.objects.filter(
+                    content_type=content_type, object_id=OuterRef("pk")
+                ),
+                "object_id",
+            ),
+        }
+        drift = Q()
+        for counter in Post.counter_fields:
+            drift |= ~Q(**{counter: F(f"actual_{counter}")})
+
+        queryset = Post.objects.alias(
+            **{f"actual_{counter}": count for counter, count in actual_counts.items()}
+        ).order_by("pk")
+
+        last_pk = 0
+        checked = fixed = 0
+
+        while True:
+            batch = Post.objects.filter(pk__gt=last_pk).order_by("pk")
+            batch = list(batch.values_list("pk", flat=True)[:batch_size])
+            if not batch:
+                break
+
+            # The counts are recomputed within the UPDATE statement itself,
+            # so that concurrent F() updates are not overwritten by stale values.
+            drifted = queryset.filter(drift, pk__in=batch).values("pk")
+            fixed += Post.objects.filter(pk__in=drifted).update(**actual_counts)
+
+            checked += len(batch)
+            last_pk = batch[-1]
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Checked {checked} posts, fixed {fixed} counters.")
+        )
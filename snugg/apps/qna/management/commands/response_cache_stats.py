@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.urls import get_resolver
+
+from snugg.cache import response_cache
+
+
+class Command(BaseCommand):
+    help = "Show the hit/miss counts of the cached responses."
+
+    def handle(self, *args, **options):
+        # Import all the views, so that every cached action is registered.
+        get_resolver().url_patterns
+
+        for name, metrics in response_cache.get_metrics().items():
+            total = metrics["hit"] + metrics["miss"]
+            ratio = metrics["hit"] / total if total else 0
+            self.stdout.write(
+                f"{name}: {metrics['hit']} hits, {metrics['miss']} misses "
+                f"({ratio:.1%} hit ratio)"
+            )
@@ -0,0 +1,56 @@
+# Generated by Django 4.0.2 on 2026-10-18 08:31
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def fill_search_vectors(apps, schema_editor):
+    Post = apps.get_model("qna", "Post")
+    Answer = apps.get_model("qna", "Answer")
+
+    Post.objects.update(
+        search_vector=SearchVector("title", weight="A", config="simple")
+        + SearchVector("content", weight="B", config="simple")
+    )
+    Answer.objects.update(
+        search_vector=SearchVector("content", weight="A", config="simple")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("qna", "0005_alter_comment_content_type"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="answer",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="answer",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="qna_answer_search"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="qna_post_search"
+            ),
+        ),
+        migrations.RunPython(fill_search_vectors, migrations.RunPython.noop),
+    ]
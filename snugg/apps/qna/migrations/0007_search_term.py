@@ -0,0 +1,57 @@
+# Generated by Django 4.0.2 on 2026-10-18 08:34
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("qna", "0006_search_vector"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchTerm",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("term", models.CharField(max_length=10)),
+                (
+                    "object_ids",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.BigIntegerField(), default=list, size=None
+                    ),
+                ),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="searchterm",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["object_ids"], name="qna_search_term_ids"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="searchterm",
+            constraint=models.UniqueConstraint(
+                fields=("content_type", "term"), name="unique_search_term"
+            ),
+        ),
+    ]
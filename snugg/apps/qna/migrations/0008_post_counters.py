@@ -0,0 +1,56 @@
+# Generated by Django 4.0.2 on 2026-10-18 08:35
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(queryset, field):
+    return Coalesce(
+        Subquery(
+            queryset.order_by()
+            .values(field)
+            .annotate(count=Count("pk"))
+            .values("count")
+        ),
+        0,
+    )
+
+
+def fill_post_counters(apps, schema_editor):
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    Post = apps.get_model("qna", "Post")
+    Answer = apps.get_model("qna", "Answer")
+    Comment = apps.get_model("qna", "Comment")
+
+    Post.objects.update(
+        answer_count=count_subquery(Answer.objects.filter(post=OuterRef("pk")), "post")
+    )
+
+    content_type = ContentType.objects.filter(app_label="qna", model="post").first()
+    if content_type is not None:
+        comments = Comment.objects.filter(
+            content_type=content_type, object_id=OuterRef("pk")
+        )
+        Post.objects.update(comment_count=count_subquery(comments, "object_id"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("qna", "0007_search_term"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="answer_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="comment_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_post_counters, migrations.RunPython.noop),
+    ]
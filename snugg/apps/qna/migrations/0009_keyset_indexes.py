@@ -0,0 +1,71 @@
+# Generated by Django 4.0.2 on 2026-10-18 08:52
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # The indexes are built without locking the tables against writes.
+    atomic = False
+
+    dependencies = [
+        ("qna", "0008_post_counters"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="answer",
+            index=models.Index(fields=["-created_at"], name="qna_answer_created_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="answer",
+            index=models.Index(fields=["-updated_at"], name="qna_answer_updated_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="answer",
+            index=models.Index(
+                fields=["post", "-created_at"], name="qna_answer_post_created_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="answer",
+            index=models.Index(
+                fields=["writer", "-created_at"], name="qna_answer_writer_created_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="comment",
+            index=models.Index(fields=["-created_at"], name="qna_comment_created_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="comment",
+            index=models.Index(fields=["-updated_at"], name="qna_comment_updated_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="comment",
+            index=models.Index(
+                fields=["content_type", "object_id", "-created_at"],
+                name="qna_comment_target_created_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="post",
+            index=models.Index(fields=["-created_at"], name="qna_post_created_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="post",
+            index=models.Index(fields=["-updated_at"], name="qna_post_updated_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="post",
+            index=models.Index(
+                fields=["writer", "-created_at"], name="qna_post_writer_created_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="post",
+            index=models.Index(
+                fields=["field", "-created_at"], name="qna_post_field_created_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 4.0.2 on 2026-10-18 08:58
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+from django.db.models import Func, OuterRef, Subquery
+from django.db.models.functions import Lower
+
+
+def fill_tag_names(apps, schema_editor):
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    Post = apps.get_model("qna", "Post")
+    TaggedItem = apps.get_model("taggit", "TaggedItem")
+
+    content_type = ContentType.objects.filter(app_label="qna", model="post").first()
+    if content_type is None:
+        return
+
+    tag_names = (
+        TaggedItem.objects.filter(content_type=content_type, object_id=OuterRef("pk"))
+        .annotate(tag_name=Lower("tag__name"))
+        .order_by("tag_name")
+        .distinct()
+        .values("tag_name")
+    )
+    Post.objects.update(
+        tag_names=Func(
+            Subquery(tag_names),
+            function="ARRAY",
+            output_field=ArrayField(models.CharField(max_length=100)),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    # The index is built without locking the table against writes.
+    atomic = False
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("taggit", "0004_alter_taggeditem_content_type_alter_taggeditem_tag"),
+        ("qna", "0009_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="tag_names",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.CharField(max_length=100),
+                blank=True,
+                default=list,
+                editable=False,
+                size=None,
+            ),
+        ),
+        migrations.RunPython(fill_tag_names, migrations.RunPython.noop, atomic=True),
+        AddIndexConcurrently(
+            model_name="post",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["tag_names"], name="qna_post_tag_names"
+            ),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.0.2 on 2026-10-18 09:00
+
+from django.db import migrations, models
+from django.db.models import Count, F, Func
+
+
+def fill_tag_stats(apps, schema_editor):
+    Post = apps.get_model("qna", "Post")
+    TagStat = apps.get_model("qna", "TagStat")
+
+    counts = (
+        Post.objects.annotate(name=Func(F("tag_names"), function="unnest"))
+        .values("name")
+        .annotate(count=Count("pk"))
+        .values_list("name", "count")
+    )
+    TagStat.objects.bulk_create(
+        [TagStat(name=name, count=count) for name, count in counts], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("qna", "0010_post_tag_names"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TagStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+                ("count", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="tagstat",
+            index=models.Index(
+                fields=["name"],
+                name="qna_tag_stat_name_prefix",
+                opclasses=("varchar_pattern_ops",),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tagstat",
+            index=models.Index(fields=["-count", "name"], name="qna_tag_stat_popular"),
+        ),
+        migrations.RunPython(fill_tag_stats, migrations.RunPython.noop),
+    ]
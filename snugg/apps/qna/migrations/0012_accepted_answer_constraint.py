@@ -0,0 +1,38 @@
+# Generated by Django 4.0.2 on 2026-10-18 09:03
+
+from django.db import migrations, models
+
+# The accepted answer must be one of the answers of the post.
+# Django has no composite foreign keys, so the constraint lives in SQL only.
+ADD_ACCEPTED_ANSWER_FK = """
+UPDATE qna_post SET accepted_answer_id = NULL
+WHERE accepted_answer_id IS NOT NULL AND NOT EXISTS (
+    SELECT 1 FROM qna_answer
+    WHERE qna_answer.id = qna_post.accepted_answer_id
+    AND qna_answer.post_id = qna_post.id
+);
+ALTER TABLE qna_post ADD CONSTRAINT qna_post_accepted_answer_of_post
+    FOREIGN KEY (accepted_answer_id, id) REFERENCES qna_answer (id, post_id)
+    DEFERRABLE INITIALLY DEFERRED;
+"""
+
+DROP_ACCEPTED_ANSWER_FK = """
+ALTER TABLE qna_post DROP CONSTRAINT qna_post_accepted_answer_of_post;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("qna", "0011_tag_stat"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="answer",
+            constraint=models.UniqueConstraint(
+                fields=("id", "post"), name="qna_answer_id_post_unique"
+            ),
+        ),
+        migrations.RunSQL(ADD_ACCEPTED_ANSWER_FK, DROP_ACCEPTED_ANSWER_FK),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.0.2 on 2026-10-18 09:06
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def detach_duplicate_answers(apps, schema_editor):
+    """
+    Keep the accepted or the earliest answer of each user on each post,
+    and detach the writer from the others, rather than deleting them.
+    """
+    Answer = apps.get_model("qna", "Answer")
+
+    duplicates = (
+        Answer.objects.exclude(writer=None)
+        .values("post", "writer")
+        .annotate(count=Count("pk"))
+        .filter(count__gt=1)
+    )
+    for duplicate in duplicates:
+        answers = Answer.objects.filter(
+            post=duplicate["post"], writer=duplicate["writer"]
+        ).order_by("bulletin", "created_at", "pk")
+        kept = answers.first()
+        answers.exclude(pk=kept.pk).update(writer=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("qna", "0012_accepted_answer_constraint"),
+    ]
+
+    operations = [
+        migrations.RunPython(detach_duplicate_answers, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="answer",
+            constraint=models.UniqueConstraint(
+                fields=("post", "writer"), name="qna_answer_post_writer_unique"
+            ),
+        ),
+    ]
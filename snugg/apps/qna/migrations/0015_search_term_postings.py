@@ -0,0 +1,86 @@
+# Generated by Django 4.0.2 on 2026-10-18 14:20
+
+from itertools import islice
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from snugg.apps.qna.tokenizers import index_ngrams
+
+# The 'search_weights' of the models, which are not available here.
+SEARCH_FIELDS = {"post": ("title", "content"), "answer": ("content",)}
+
+
+def index_search_terms(apps, schema_editor):
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    SearchTerm = apps.get_model("qna", "SearchTerm")
+
+    for name, fields in SEARCH_FIELDS.items():
+        model = apps.get_model("qna", name)
+        if not model.objects.exists():
+            continue
+
+        content_type, _ = ContentType.objects.get_or_create(app_label="qna", model=name)
+        postings = (
+            SearchTerm(content_type=content_type, term=term, object_id=values[0])
+            for values in model.objects.values_list("pk", *fields).iterator()
+            for term in set().union(*map(index_ngrams, values[1:]))
+        )
+        while True:
+            batch = list(islice(postings, 10000))
+            if not batch:
+                break
+            SearchTerm.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("qna", "0014_post_excerpt"),
+    ]
+
+    # The posting lists are replaced by postings of a single object each,
+    # indexing the trigrams as well.
+    operations = [
+        migrations.DeleteModel(
+            name="SearchTerm",
+        ),
+        migrations.CreateModel(
+            name="SearchTerm",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("term", models.CharField(max_length=10)),
+                ("object_id", models.BigIntegerField()),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="searchterm",
+            index=models.Index(
+                fields=["content_type", "object_id"], name="qna_search_term_object"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="searchterm",
+            constraint=models.UniqueConstraint(
+                fields=("content_type", "term", "object_id"),
+                name="unique_search_term",
+            ),
+        ),
+        migrations.RunPython(index_search_terms, migrations.RunPython.noop),
+    ]
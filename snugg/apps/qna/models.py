@@ -1,16 +1,172 @@
+from collections import Counter, defaultdict
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.contenttypes.models import ContentType
-from django.db import models
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import models, transaction
+from django.db.models import Count, Exists, Func, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Lower, Now
+from django.db.models.signals import m2m_changed
+from django.utils import timezone
 from mptt.fields import TreeForeignKey
 from mptt.models import MPTTModel
 from taggit.managers import TaggableManager
+from taggit.models import Tag, TaggedItem
+
+from snugg.excerpts import EXCERPT_LENGTH, make_excerpt
+
+from .tokenizers import index_ngrams
 
 User = get_user_model()
 choice_limit = (
     models.Q(model="post") | models.Q(model="answer") | models.Q(model="comment")
 )
 
+# Korean text is not stemmed by any of the built-in configurations,
+# so keep the lexemes as they are.
+SEARCH_CONFIG = "simple"
+
+
+class SearchableModel(models.Model):
+    """
+    Abstract model maintaining a weighted 'search_vector' column.
+
+    'search_weights' maps each searchable field to its weight label ("A" ~ "D").
+    The vector is refreshed on every save touching one of those fields.
+    """
+
+    search_weights = {}
+
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        abstract = True
+        indexes = (
+            GinIndex(fields=("search_vector",), name="%(app_label)s_%(class)s_search"),
+        )
+
+    @classmethod
+    def get_search_vector(cls):
+        vectors = [
+            SearchVector(field, weight=weight, config=SEARCH_CONFIG)
+            for field, weight in cls.search_weights.items()
+        ]
+        vector = vectors[0]
+        for other in vectors[1:]:
+            vector += other
+
+        return vector
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or set(update_fields) & set(self.search_weights):
+            type(self).objects.filter(pk=self.pk).update(
+                search_vector=self.get_search_vector()
+            )
+            SearchTerm.objects.index(self)
+
+    def get_search_terms(self):
+        return set().union(
+            *(index_ngrams(getattr(self, field)) for field in self.search_weights)
+        )
+
+
+class SearchTermManager(models.Manager):
+    """
+    Maintains the postings of 'SearchTerm', one row per term and object.
+
+    Only the rows of the terms added to or removed from an object are inserted
+    or deleted. Objects sharing common n-grams are indexed concurrently,
+    without updating, nor locking, any row of the others. Stale terms left by
+    concurrent saves of the same object only add candidates to the searches,
+    which confirm the matches anyway.
+    """
+
+    def intersection(self, model, terms):
+        """
+        Return a subquery of the ids of the 'model' objects containing every
+        given term, the postings being intersected in the database.
+        """
+        content_type = ContentType.objects.get_for_model(model)
+
+        return (
+            self.filter(content_type=content_type, term__in=sorted(terms))
+            .values("object_id")
+            .annotate(matched=Count("term"))
+            .filter(matched=len(terms))
+            .values("object_id")
+        )
+
+    def lookup(self, model, terms):
+        """
+        Return the ids of the 'model' objects containing every given term.
+        """
+        return set(
+            model.objects.filter(pk__in=self.intersection(model, terms)).values_list(
+                "pk", flat=True
+            )
+        )
+
+    @transaction.atomic
+    def index(self, obj):
+        content_type = ContentType.objects.get_for_model(obj)
+        terms = obj.get_search_terms()
+        postings = self.filter(content_type=content_type, object_id=obj.pk)
+
+        indexed = set(postings.values_list("term", flat=True))
+        removed = indexed - terms
+        added = terms - indexed
+
+        if removed:
+            postings.filter(term__in=removed).delete()
+        if added:
+            self.bulk_create(
+                [
+                    self.model(content_type=content_type, term=term, object_id=obj.pk)
+                    for term in sorted(added)
+                ],
+                ignore_conflicts=True,
+            )
+
+    def unindex(self, obj):
+        content_type = ContentType.objects.get_for_model(obj)
+        self.filter(content_type=content_type, object_id=obj.pk).delete()
+
+
+class SearchTerm(models.Model):
+    """
+    Inverted index of the Korean n-grams of 'SearchableModel' objects.
+
+    Each row is the posting of a single term in a single object.
+    """
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    term = models.CharField(max_length=10)
+    object_id = models.BigIntegerField()
+
+    objects = SearchTermManager()
+
+    class Meta:
+        constraints = (
+            # Backs the lookups of the terms as well.
+            models.UniqueConstraint(
+                fields=("content_type", "term", "object_id"),
+                name="unique_search_term",
+            ),
+        )
+        # Backs the lookups of the terms of an object.
+        indexes = (
+            models.Index(
+                fields=("content_type", "object_id"), name="qna_search_term_object"
+            ),
+        )
+
 
 class Field(MPTTModel):
     name = models.CharField(max_length=20)
@@ -22,7 +178,9 @@ class Field(MPTTModel):
         return self.name
 
 
-class Answer(models.Model):
+class Answer(SearchableModel):
+    search_weights = {"content": "A"}
+
     post = models.ForeignKey("Post", null=True, on_delete=models.CASCADE)
     writer = models.ForeignKey(User, null=True, on_delete=models.SET_NULL)
     content = models.TextField()
@@ -30,6 +188,67 @@ class Answer(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta(SearchableModel.Meta):
+        constraints = (
+            # Referenced by the accepted answer of the post, along with the post.
+            models.UniqueConstraint(
+                fields=("id", "post"), name="qna_answer_id_post_unique"
+            ),
+            # One answer per user per post.
+            models.UniqueConstraint(
+                fields=("post", "writer"), name="qna_answer_post_writer_unique"
+            ),
+        )
+        # Back the cursor paginations, optionally filtered by the post or the writer.
+        indexes = SearchableModel.Meta.indexes + (
+            models.Index(fields=("-created_at",), name="qna_answer_created_idx"),
+            models.Index(fields=("-updated_at",), name="qna_answer_updated_idx"),
+            models.Index(
+                fields=("post", "-created_at"), name="qna_answer_post_created_idx"
+            ),
+            models.Index(
+                fields=("writer", "-created_at"), name="qna_answer_writer_created_idx"
+            ),
+        )
+
+
+class CommentQuerySet(models.QuerySet):
+    def annotate_replies_count(self):
+        """
+        Count the replies of every comment in a single correlated subquery.
+        """
+        replies = (
+            Comment.objects.filter(
+                content_type=ContentType.objects.get_for_model(Comment),
+                object_id=OuterRef("pk"),
+            )
+            .order_by()
+            .values("object_id")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+
+        return self.annotate(replies_count=Coalesce(Subquery(replies), 0))
+
+    def attach_replies(self, comments):
+        """
+        Load the replies of all the given comments in a single query,
+        and set them as the 'replies' attribute of each comment.
+        """
+        replies = defaultdict(list)
+        queryset = self.select_related("writer").filter(
+            content_type=ContentType.objects.get_for_model(Comment),
+            object_id__in=[comment.pk for comment in comments],
+        )
+
+        for reply in queryset.order_by("created_at", "pk"):
+            replies[reply.object_id].append(reply)
+
+        for comment in comments:
+            comment.replies = replies[comment.pk]
+
+        return comments
+
 
 class Comment(models.Model):
     writer = models.ForeignKey(User, null=True, on_delete=models.SET_NULL)
@@ -42,12 +261,146 @@ class Comment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CommentQuerySet.as_manager()
+
+    class Meta:
+        indexes = (
+            models.Index(fields=("-created_at",), name="qna_comment_created_idx"),
+            models.Index(fields=("-updated_at",), name="qna_comment_updated_idx"),
+            models.Index(
+                fields=("content_type", "object_id", "-created_at"),
+                name="qna_comment_target_created_idx",
+            ),
+        )
+
+
+class TagStatManager(models.Manager):
+    """
+    Maintains the usage counts of the tags, incrementally.
+
+    The rows are always locked in the order of their names,
+    so that concurrent writers sharing common tags do not deadlock.
+    """
+
+    @transaction.atomic
+    def apply(self, deltas):
+        """
+        Add the given deltas to the counts, e.g. {"django": 1, "flask": -1}.
+        A drifted count never goes below zero.
+        """
+        deltas = {name: delta for name, delta in deltas.items() if delta}
+        if not deltas:
+            return
+
+        self.bulk_create(
+            [self.model(name=name) for name in deltas], ignore_conflicts=True
+        )
+        list(
+            self.filter(name__in=deltas)
+            .order_by("name")
+            .select_for_update()
+            .values_list("pk")
+        )
+
+        for delta in set(deltas.values()):
+            queryset = self.filter(
+                name__in=[name for name in deltas if deltas[name] == delta]
+            )
+            if delta < 0:
+                queryset = queryset.filter(count__gte=-delta)
+            queryset.update(count=models.F("count") + delta)
+
+
+class TagStat(models.Model):
+    """
+    Number of the posts using each tag, named in lowercase.
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    count = models.PositiveIntegerField(default=0)
+
+    objects = TagStatManager()
+
+    class Meta:
+        indexes = (
+            # Prefix lookups, independent of the collation of the database.
+            models.Index(
+                fields=("name",),
+                opclasses=("varchar_pattern_ops",),
+                name="qna_tag_stat_name_prefix",
+            ),
+            models.Index(fields=("-count", "name"), name="qna_tag_stat_popular"),
+        )
+
+
+class PostQuerySet(models.QuerySet):
+    @transaction.atomic
+    def sync_tag_names(self):
+        """
+        Recompute the denormalized 'tag_names' from the tags, in a single UPDATE,
+        and apply the differences to the tag statistics.
+        """
+        tag_names = (
+            TaggedItem.objects.filter(
+                content_type=ContentType.objects.get_for_model(Post),
+                object_id=OuterRef("pk"),
+            )
+            .annotate(tag_name=Lower("tag__name"))
+            .order_by("tag_name")
+            .distinct()
+            .values("tag_name")
+        )
+
+        old_tag_names = dict(
+            self.order_by("pk").select_for_update().values_list("pk", "tag_names")
+        )
+        queryset = Post.objects.filter(pk__in=old_tag_names)
+        # 'updated_at' too, for the validators of the conditional requests.
+        count = queryset.update(
+            tag_names=Func(
+                Subquery(tag_names),
+                function="ARRAY",
+                output_field=ArrayField(models.CharField(max_length=100)),
+            ),
+            updated_at=timezone.now(),
+        )
+
+        deltas = Counter()
+        for pk, names in queryset.values_list("pk", "tag_names"):
+            deltas.update(names)
+            deltas.subtract(old_tag_names[pk])
+        TagStat.objects.apply(deltas)
+
+        return count
+
+    def accept(self, pk, answer_id, user):
+        """
+        Accept the answer in a single conditional UPDATE, which fails
+        if the post is not written by the user, an answer is already accepted,
+        or the answer is not of the post or written by the user.
+        Return whether the answer is accepted.
+        """
+        answer = Answer.objects.filter(pk=answer_id, post_id=OuterRef("pk")).exclude(
+            writer=user
+        )
+        updated = self.filter(
+            Exists(answer), pk=pk, writer=user, accepted_answer__isnull=True
+        ).update(accepted_answer_id=answer_id, updated_at=Now())
+
+        return updated > 0
+
+
+class Post(SearchableModel):
+    search_weights = {"title": "A", "content": "B"}
 
-class Post(models.Model):
     field = TreeForeignKey("Field", null=True, blank=True, on_delete=models.SET_NULL)
     writer = models.ForeignKey(User, null=True, on_delete=models.SET_NULL)
     title = models.CharField(max_length=50)
     content = models.TextField()
+    # Plain text preview of the content, for the feeds. Computed on save.
+    excerpt = models.CharField(
+        max_length=EXCERPT_LENGTH, blank=True, default="", editable=False
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     accepted_answer = models.OneToOneField(
@@ -59,20 +412,136 @@ class Post(models.Model):
     )
     comments = GenericRelation("Comment", related_query_name="post")
     tags = TaggableManager()
+    answer_count = models.PositiveIntegerField(default=0, editable=False)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    # Lowercased names of the tags, for the indexed filtering of the tag sets.
+    tag_names = ArrayField(
+        models.CharField(max_length=100), default=list, blank=True, editable=False
+    )
+
+    objects = PostQuerySet.as_manager()
+
+    # Maintained with atomic F() updates only. See 'signals.py'.
+    counter_fields = ("answer_count", "comment_count")
+    # Never written back from the instances. See 'signals.py'.
+    denormalized_fields = counter_fields + ("tag_names",)
+
+    class Meta(SearchableModel.Meta):
+        # Back the cursor paginations, optionally filtered by the writer or the field.
+        indexes = SearchableModel.Meta.indexes + (
+            models.Index(fields=("-created_at",), name="qna_post_created_idx"),
+            models.Index(fields=("-updated_at",), name="qna_post_updated_idx"),
+            models.Index(
+                fields=("writer", "-created_at"), name="qna_post_writer_created_idx"
+            ),
+            models.Index(
+                fields=("field", "-created_at"), name="qna_post_field_created_idx"
+            ),
+            GinIndex(fields=("tag_names",), name="qna_post_tag_names"),
+        )
 
     def save(self, *args, **kwargs):
         """
         If this Post object is not created yet,
         or the accepted answer's 'post' field does not point to this object,
         the accepted answer is forced to be None.
+
+        The counters and the tag names are never written back from the instance,
+        since they might have been changed after it was loaded.
+        The excerpt is written along with the content.
         """
         if self.pk is None or (
             self.accepted_answer and self.accepted_answer.post != self
         ):
             self.accepted_answer = None
 
+        self.excerpt = make_excerpt(self.content)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "content" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "excerpt"}
+
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.denormalized_fields
+            ]
+
         super().save(*args, **kwargs)
 
+    @transaction.atomic
+    def set_tags(self, names):
+        """
+        Replace the tags with the given names, in a fixed number of queries
+        however many tags are given, unlike the one-by-one 'tags.set()'.
+
+        Names are matched case-insensitively if TAGGIT_CASE_INSENSITIVE is set,
+        the same way taggit does.
+        """
+        case_insensitive = getattr(settings, "TAGGIT_CASE_INSENSITIVE", False)
+        normalize = str.lower if case_insensitive else str
+
+        # The first spelling of the same names wins.
+        names_by_key = {}
+        for name in names:
+            names_by_key.setdefault(normalize(name), name)
+
+        def get_tags():
+            if case_insensitive:
+                queryset = Tag.objects.annotate(key=Lower("name"))
+            else:
+                queryset = Tag.objects.annotate(key=models.F("name"))
+
+            return {tag.key: tag for tag in queryset.filter(key__in=names_by_key)}
+
+        tags = get_tags()
+        missing = [name for key, name in names_by_key.items() if key not in tags]
+
+        if missing:
+            Tag.objects.bulk_create(
+                [Tag(name=name, slug=Tag().slugify(name)) for name in missing],
+                ignore_conflicts=True,
+            )
+            tags = get_tags()
+
+            # Conflicting slugs are resolved by taggit, one by one.
+            for key, name in names_by_key.items():
+                if key not in tags:
+                    tags[key] = Tag.objects.create(name=name)
+
+        content_type = ContentType.objects.get_for_model(Post)
+        items = TaggedItem.objects.filter(content_type=content_type, object_id=self.pk)
+        tag_ids = {tag.pk for tag in tags.values()}
+        current_ids = set(items.values_list("tag_id", flat=True))
+
+        removed_ids = current_ids - tag_ids
+        added_ids = tag_ids - current_ids
+
+        # The same signals as 'tags.set()' keep the denormalized data in sync.
+        if removed_ids:
+            items.filter(tag_id__in=removed_ids).delete()
+            self._send_tags_changed("post_remove", removed_ids)
+        if added_ids:
+            TaggedItem.objects.bulk_create(
+                [
+                    TaggedItem(content_type=content_type, object_id=self.pk, tag_id=pk)
+                    for pk in added_ids
+                ],
+                ignore_conflicts=True,
+            )
+            self._send_tags_changed("post_add", added_ids)
+
+    def _send_tags_changed(self, action, pk_set):
+        m2m_changed.send(
+            sender=Post.tags.through,
+            instance=self,
+            action=action,
+            reverse=False,
+            model=Tag,
+            pk_set=pk_set,
+            using=self._state.db,
+        )
+
 
 # class Tag(models.Model):
 #     posts = models.ManyToManyField("Post")
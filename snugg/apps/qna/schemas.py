@@ -7,11 +7,16 @@ from drf_spectacular.utils import (
 )
 
 from .serializers import (
+    AcceptAnswerSerializer,
     CommentAnswerSerializer,
     CommentPostSerializer,
     CommentSerializer,
+    CommentThreadSerializer,
+    FieldTreeSerializer,
+    PostDiscussionSerializer,
     PostSerializer,
     ReplySerializer,
+    TagStatSerializer,
 )
 
 post_viewset_schema = extend_schema_view(
@@ -29,6 +34,12 @@ post_viewset_schema = extend_schema_view(
     retrieve=extend_schema(
         summary="Retrieve QNA Post",
         description="Retrieve a post on the QNA board.",
+        parameters=[
+            OpenApiParameter(
+                name="fields",
+                description="Return only the comma-seperated fields",
+            ),
+        ],
         responses={
             200: OpenApiResponse(response=PostSerializer),
             404: OpenApiResponse(description="Post for given id not found"),
@@ -43,8 +54,56 @@ post_viewset_schema = extend_schema_view(
                 name="search_type",
                 description="Customize search type with comma-seperate fields",
             ),
+            OpenApiParameter(
+                name="field_tree",
+                description="Filter by the field and all of its descendants",
+            ),
+            OpenApiParameter(
+                name="tags_any",
+                description="Filter by any of the comma-seperated tags",
+            ),
+            OpenApiParameter(
+                name="tags_all",
+                description="Filter by all of the comma-seperated tags",
+            ),
+            OpenApiParameter(
+                name="fields",
+                description="Return only the comma-seperated fields",
+            ),
+            OpenApiParameter(
+                name="compact",
+                type=OpenApiTypes.BOOL,
+                description="Return the excerpt of the content only",
+            ),
         ],
     ),
+    discussion=extend_schema(
+        summary="Retrieve QNA Post Discussion",
+        description="Retrieve a post on the QNA board with its answers, "
+        "the accepted one first, and the comments and replies on each of them.",
+        responses={
+            200: OpenApiResponse(response=PostDiscussionSerializer),
+            404: OpenApiResponse(description="Post for given id not found"),
+        },
+    ),
+    accept=extend_schema(
+        summary="Accept QNA Answer",
+        description="Accept an answer of the post. "
+        "Only the writer of the post can accept an answer written by another user, "
+        "once.",
+        responses={
+            200: OpenApiResponse(response=AcceptAnswerSerializer),
+            400: OpenApiResponse(
+                description="The answer is not of the post, is written by the user, "
+                "or another answer is already accepted."
+            ),
+            401: OpenApiResponse(
+                description="Missing authentication header, or access token expired."
+            ),
+            403: OpenApiResponse(description="Requesting user is not the writer."),
+            404: OpenApiResponse(description="Post for given id not found"),
+        },
+    ),
     update=extend_schema(
         summary="Update QNA Post",
         description="Update a post on the QNA board.",
@@ -133,6 +192,20 @@ comment_list_view = extend_schema(
     },
 )
 
+comment_thread_view = extend_schema(
+    summary="List Comment Thread with parent's id",
+    description="List the Comments with their replies. ?answer={answer_id} or ?post={post_id}",
+    parameters=[
+        OpenApiParameter(name="answer", description="Answer id", type=OpenApiTypes.INT),
+        OpenApiParameter(name="post", description="Post id", type=OpenApiTypes.INT),
+    ],
+    responses={
+        200: OpenApiResponse(response=CommentThreadSerializer),
+        400: OpenApiResponse(description="Invalid or insufficient data."),
+        404: OpenApiResponse(description="Parent not found."),
+    },
+)
+
 comment_viewset_schema = extend_schema_view(
     retrieve=extend_schema(
         summary="Retrieve Comment",
@@ -187,3 +260,23 @@ comment_viewset_schema = extend_schema_view(
         },
     ),
 )
+
+field_list_view = extend_schema(
+    summary="List QNA Fields",
+    description="List the whole tree of the fields, the children nested in their parents.",
+    responses={200: OpenApiResponse(response=FieldTreeSerializer(many=True))},
+)
+
+tag_list_view = extend_schema(
+    summary="List QNA Tags",
+    description="List the most used tags, or the tags starting with the given prefix.",
+    parameters=[
+        OpenApiParameter(name="prefix", description="Prefix of the tags, while typing"),
+        OpenApiParameter(
+            name="limit",
+            type=OpenApiTypes.INT,
+            description="Number of the tags, up to 50",
+        ),
+    ],
+    responses={200: OpenApiResponse(response=TagStatSerializer(many=True))},
+)
@@ -0,0 +1,124 @@
+import operator
+from functools import reduce
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField
+from django.db.models import F, FloatField, Func, Q, Value
+from rest_framework.filters import SearchFilter
+
+from .models import SEARCH_CONFIG, SearchTerm
+from .tokenizers import query_ngrams
+
+
+class WeightFilter(Func):
+    """
+    ts_filter(vector, weights) keeps only the lexemes labeled with given weights.
+    """
+
+    function = "ts_filter"
+    template = '%(function)s(%(expressions)s::"char"[])'
+    output_field = SearchVectorField()
+
+    def __init__(self, expression, weights, **extra):
+        weights = "{%s}" % ",".join(weight.lower() for weight in sorted(weights))
+        super().__init__(expression, Value(weights), **extra)
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    'SearchFilter' backed by the 'search_vector' column of 'SearchableModel'.
+
+    The view's 'search_fields' are looked up in the model's 'search_weights'.
+    If only some of the weighted fields are searched, the GIN index narrows
+    down the rows first and 'ts_filter' drops the matches from other fields.
+
+    Every queryset is annotated with 'search_rank',
+    so that clients can pass 'ordering=-search_rank'.
+    """
+
+    rank_field = "search_rank"
+
+    def get_search_query(self, search_terms):
+        query = None
+        for term in search_terms:
+            term_query = SearchQuery(term, config=SEARCH_CONFIG, search_type="plain")
+            query = term_query if query is None else query & term_query
+
+        return query
+
+    def get_search_vector(self, queryset, search_fields):
+        search_weights = queryset.model.search_weights
+        weights = {search_weights[field] for field in search_fields}
+        vector = F("search_vector")
+
+        if weights != set(search_weights.values()):
+            vector = WeightFilter(vector, weights)
+
+        return vector
+
+    def search(self, queryset, search_terms, search_fields):
+        query = self.get_search_query(search_terms)
+        queryset = queryset.filter(search_vector=query)
+        vector = self.get_search_vector(queryset, search_fields)
+
+        if isinstance(vector, WeightFilter):
+            queryset = queryset.alias(weighted_vector=vector).filter(
+                weighted_vector=query
+            )
+
+        return queryset
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = [
+            field
+            for field in self.get_search_fields(view, request) or ()
+            if field in queryset.model.search_weights
+        ]
+        search_terms = self.get_search_terms(request)
+
+        if not search_fields or not search_terms:
+            return queryset.annotate(
+                **{self.rank_field: Value(0.0, output_field=FloatField())}
+            )
+
+        queryset = self.search(queryset, search_terms, search_fields)
+        rank = SearchRank(
+            self.get_search_vector(queryset, search_fields),
+            self.get_search_query(search_terms),
+        )
+
+        return queryset.annotate(**{self.rank_field: rank})
+
+
+class NgramSearchFilter(FullTextSearchFilter):
+    """
+    Korean-aware 'FullTextSearchFilter'.
+
+    Terms with Hangul n-grams are looked up in the 'SearchTerm' inverted index,
+    by their trigrams if long enough, and only the intersection of their
+    postings is scanned to confirm the substring matches.
+    The other terms are left to the full text search.
+    """
+
+    def search(self, queryset, search_terms, search_fields):
+        term_ngrams = {term: query_ngrams(term) for term in search_terms}
+        ngram_terms = [term for term in search_terms if term_ngrams[term]]
+        other_terms = [term for term in search_terms if not term_ngrams[term]]
+
+        if other_terms:
+            queryset = super().search(queryset, other_terms, search_fields)
+
+        if ngram_terms:
+            object_ids = SearchTerm.objects.intersection(
+                queryset.model, set().union(*term_ngrams.values())
+            )
+            queryset = queryset.filter(pk__in=object_ids)
+
+            for term in ngram_terms:
+                queryset = queryset.filter(
+                    reduce(
+                        operator.or_,
+                        (Q(**{f"{field}__icontains": term}) for field in search_fields),
+                    )
+                )
+
+        return queryset
@@ -1,23 +1,37 @@
+from collections import defaultdict
+from contextlib import contextmanager
+
 from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, transaction
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import OpenApiTypes, extend_schema_field
 from rest_framework import serializers
+from taggit.models import TaggedItem
 from taggit.serializers import TaggitSerializer, TagListSerializerField
 
 from snugg.apps.user.serializers import UserPublicSerializer
+from snugg.values import Lookup, Related, ValuesSerializer
+
+from .models import Answer, Comment, Field, Post, TagStat
+from .taxonomy import field_tree
+
+
+def get_constraint_name(error):
+    diag = getattr(error.__cause__, "diag", None)
+
+    return getattr(diag, "constraint_name", None)
+
 
-from .models import Answer, Comment, Field, Post
+ACCEPTED_ANSWER_MOVED = "채택된 답변은 다른 질문으로 옮길 수 없습니다."
 
 
 class FieldField(serializers.RelatedField):
     queryset = Field.objects.all()
 
     def to_internal_value(self, data):
-        queryset = self.get_queryset()
-
-        try:
-            field = queryset.get(name__iexact=data)
-        except Field.DoesNotExist:
+        # Resolved from the in-memory snapshot of the tree, without any query.
+        field = field_tree.get(str(data))
+        if field is None:
             raise serializers.ValidationError("존재하지 않는 분야(field)입니다.")
 
         return field
@@ -26,10 +40,34 @@ class FieldField(serializers.RelatedField):
         return value.name
 
 
+class FieldTreeSerializer(serializers.Serializer):
+    pk = serializers.IntegerField()
+    name = serializers.CharField()
+    children = serializers.ListField(child=serializers.DictField())
+
+
+class SortedTagListSerializerField(TagListSerializerField):
+    """
+    Tags sorted by name, since prefetched tags come in no particular order.
+    """
+
+    def to_representation(self, value):
+        value = super().to_representation(value)
+        value.sort()
+
+        return value
+
+
+class TagStatSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TagStat
+        fields = ("name", "count")
+
+
 class PostSerializer(TaggitSerializer, serializers.ModelSerializer):
     field = FieldField()
     writer = UserPublicSerializer(read_only=True)
-    tags = TagListSerializerField(required=False)
+    tags = SortedTagListSerializerField(required=False)
 
     class Meta:
         model = Post
@@ -39,10 +77,13 @@ class PostSerializer(TaggitSerializer, serializers.ModelSerializer):
             "writer",
             "title",
             "content",
+            "excerpt",
             "created_at",
             "updated_at",
             "accepted_answer",
             "tags",
+            "answer_count",
+            "comment_count",
         )
         read_only_fields = ("created_at", "updated_at")
 
@@ -65,6 +106,36 @@ class PostSerializer(TaggitSerializer, serializers.ModelSerializer):
 
         return super().create(validated_data)
 
+    def _save_tags(self, tag_object, tags):
+        if "tags" in tags:
+            tag_object.set_tags(tags["tags"])
+
+        return tag_object
+
+
+def get_post_tags(pks):
+    tags = defaultdict(list)
+    items = TaggedItem.objects.filter(
+        content_type=ContentType.objects.get_for_model(Post), object_id__in=pks
+    )
+
+    for pk, name in items.values_list("object_id", "tag__name"):
+        tags[pk].append(name)
+
+    # Sorted the same way as 'SortedTagListSerializerField'.
+    for names in tags.values():
+        names.sort()
+
+    return tags
+
+
+class PostValuesSerializer(ValuesSerializer):
+    serializer_class = PostSerializer
+    overrides = {
+        "field": Lookup("field__name"),
+        "tags": Related(get_post_tags),
+    }
+
 
 class AnswerSerializer(serializers.ModelSerializer):
     writer = UserPublicSerializer(read_only=True)
@@ -83,21 +154,50 @@ class AnswerSerializer(serializers.ModelSerializer):
         read_only_fields = ("writer", "created_at", "updated_at")
 
     def validate_post(self, post):
-        if post.accepted_answer is not None:
+        answer = self.instance
+        if (
+            answer is not None
+            and answer.post_id != post.pk
+            and Post.objects.filter(accepted_answer=answer).exists()
+        ):
+            raise serializers.ValidationError(ACCEPTED_ANSWER_MOVED)
+        if post.accepted_answer_id is not None:
             raise serializers.ValidationError("이미 답변이 채택된 질문입니다.")
 
-        user = self.context.get("request").user
-
-        if post.answer_set.filter(writer=user).exists():
-            raise serializers.ValidationError("이미 답변을 단 질문입니다.")
-
         return post
 
+    @contextmanager
+    def unique_answer(self):
+        """
+        One answer per user per post is enforced by the unique constraint,
+        which holds for concurrent requests as well. So is the post of the
+        accepted answer, by the foreign key checked when committing.
+        """
+        try:
+            with transaction.atomic():
+                yield
+        except IntegrityError as error:
+            constraint_name = get_constraint_name(error)
+            if constraint_name == "qna_answer_post_writer_unique":
+                raise serializers.ValidationError({"post": ["이미 답변을 단 질문입니다."]})
+            if constraint_name == "qna_post_accepted_answer_of_post":
+                raise serializers.ValidationError({"post": [ACCEPTED_ANSWER_MOVED]})
+            raise
+
     def create(self, validated_data):
         user = self.context.get("request").user
         validated_data["writer"] = user
 
-        return super().create(validated_data)
+        with self.unique_answer():
+            return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        with self.unique_answer():
+            return super().update(instance, validated_data)
+
+
+class AnswerValuesSerializer(ValuesSerializer):
+    serializer_class = AnswerSerializer
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -148,8 +248,14 @@ class CommentSerializer(serializers.ModelSerializer):
 
     @extend_schema_field(OpenApiTypes.INT)
     def get_replies_count(self, comment):
+        # Precomputed by 'CommentQuerySet.annotate_replies_count' for the querysets.
+        replies_count = getattr(comment, "replies_count", None)
+        if replies_count is not None:
+            return replies_count
+
         return Comment.objects.filter(
-            content_type__comment__object_id=comment.id
+            content_type=ContentType.objects.get_for_model(Comment),
+            object_id=comment.pk,
         ).count()
 
 
@@ -181,3 +287,27 @@ class ReplySerializer(CommentSerializer):
             "object_id": {"required": False, "write_only": True},
             "content_type": {"required": False, "write_only": True},
         }
+
+
+class CommentThreadSerializer(CommentSerializer):
+    replies = ReplySerializer(many=True, read_only=True)
+
+    class Meta(CommentSerializer.Meta):
+        fields = CommentSerializer.Meta.fields + ("replies",)
+
+
+class AnswerDiscussionSerializer(AnswerSerializer):
+    comments = CommentThreadSerializer(many=True, read_only=True, source="thread")
+
+    class Meta(AnswerSerializer.Meta):
+        fields = AnswerSerializer.Meta.fields + ("comments",)
+
+
+class PostDiscussionSerializer(serializers.Serializer):
+    post = PostSerializer(read_only=True)
+    comments = CommentThreadSerializer(many=True, read_only=True)
+    answers = AnswerDiscussionSerializer(many=True, read_only=True)
+
+
+class AcceptAnswerSerializer(serializers.Serializer):
+    answer = serializers.IntegerField()
@@ -0,0 +1,165 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from mptt.signals import node_moved
+from taggit.models import Tag
+
+from snugg.cache import response_cache
+
+from .models import Answer, Comment, Field, Post, SearchTerm, TagStat
+from .taxonomy import FIELD_NAMESPACE
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Answer)
+def unindex_search_terms(sender, instance, **kwargs):
+    SearchTerm.objects.unindex(instance)
+
+
+def update_post_counter(post_id, counter, delta):
+    queryset = Post.objects.filter(pk=post_id)
+
+    # Never let a drifted counter go below zero.
+    if delta < 0:
+        queryset = queryset.filter(**{f"{counter}__gte": -delta})
+
+    queryset.update(**{counter: F(counter) + delta})
+
+
+def is_post_comment(comment):
+    return comment.content_type_id == ContentType.objects.get_for_model(Post).id
+
+
+@receiver(post_save, sender=Answer)
+def increase_answer_count(sender, instance, created, **kwargs):
+    if created:
+        update_post_counter(instance.post_id, "answer_count", 1)
+
+
+@receiver(post_delete, sender=Answer)
+def decrease_answer_count(sender, instance, **kwargs):
+    update_post_counter(instance.post_id, "answer_count", -1)
+
+
+@receiver(post_save, sender=Comment)
+def increase_comment_count(sender, instance, created, **kwargs):
+    if created and is_post_comment(instance):
+        update_post_counter(instance.object_id, "comment_count", 1)
+
+
+@receiver(post_delete, sender=Comment)
+def decrease_comment_count(sender, instance, **kwargs):
+    if is_post_comment(instance):
+        update_post_counter(instance.object_id, "comment_count", -1)
+
+
+def get_comment_post_id(content_type_id, object_id):
+    """
+    Find the post which a comment belongs to, following at most two parents.
+    """
+    content_type = ContentType.objects.get_for_id(content_type_id)
+
+    if content_type.model_class() is Post:
+        return object_id
+    if content_type.model_class() is Answer:
+        return (
+            Answer.objects.filter(pk=object_id)
+            .values_list("post_id", flat=True)
+            .first()
+        )
+
+    parent = (
+        Comment.objects.filter(pk=object_id)
+        .values_list("content_type_id", "object_id")
+        .first()
+    )
+    if parent is None:
+        return None
+
+    return get_comment_post_id(*parent)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_responses(sender, instance, **kwargs):
+    response_cache.invalidate_on_commit("qna:posts", f"qna:post:{instance.pk}")
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def sync_post_tag_names(sender, instance, action, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if isinstance(instance, Post):
+        Post.objects.filter(pk=instance.pk).sync_tag_names()
+    elif pk_set:
+        Post.objects.filter(pk__in=pk_set).sync_tag_names()
+
+
+@receiver(post_save, sender=Tag)
+def sync_renamed_tag_names(sender, instance, created, **kwargs):
+    if not created:
+        Post.objects.filter(tags=instance).sync_tag_names()
+        response_cache.invalidate_on_commit("qna:tags")
+
+
+@receiver(pre_delete, sender=Post)
+def discount_post_tags(sender, instance, **kwargs):
+    tag_names = Post.objects.filter(pk=instance.pk).values_list("tag_names", flat=True)
+    TagStat.objects.apply({name: -1 for names in tag_names for name in names})
+    response_cache.invalidate_on_commit("qna:tags")
+
+
+@receiver(post_delete, sender=Tag)
+def sync_deleted_tag_names(sender, instance, **kwargs):
+    # The tagged items are already gone, but the names are still there.
+    Post.objects.filter(tag_names__contains=[instance.name.lower()]).sync_tag_names()
+    response_cache.invalidate_on_commit("qna:tags")
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def invalidate_post_tag_responses(sender, instance, action, **kwargs):
+    if action.startswith("post_") and isinstance(instance, Post):
+        response_cache.invalidate_on_commit(
+            "qna:posts", f"qna:post:{instance.pk}", "qna:tags"
+        )
+
+
+@receiver(post_save, sender=Answer)
+@receiver(post_delete, sender=Answer)
+def invalidate_answer_responses(sender, instance, **kwargs):
+    # Answer counts and the discussion of the post are changed as well.
+    response_cache.invalidate_on_commit(
+        "qna:answers",
+        f"qna:answer:{instance.pk}",
+        "qna:posts",
+        f"qna:post:{instance.post_id}",
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_responses(sender, instance, **kwargs):
+    namespaces = ["qna:comments", f"qna:comment:{instance.pk}"]
+
+    if is_post_comment(instance):
+        namespaces.append("qna:posts")
+    elif instance.content_type_id == ContentType.objects.get_for_model(Comment).id:
+        # Replies count of the parent comment.
+        namespaces.append(f"qna:comment:{instance.object_id}")
+
+    post_id = get_comment_post_id(instance.content_type_id, instance.object_id)
+    if post_id is not None:
+        namespaces.append(f"qna:post:{post_id}")
+
+    response_cache.invalidate_on_commit(*namespaces)
+
+
+@receiver(post_save, sender=Field)
+@receiver(post_delete, sender=Field)
+@receiver(node_moved, sender=Field)
+def invalidate_field_tree(sender, instance, **kwargs):
+    # Posts show the names of their fields. Once more after the commit as well,
+    # in case that other processes have reloaded their snapshots in the meantime.
+    response_cache.invalidate_on_commit(FIELD_NAMESPACE, "qna:posts")
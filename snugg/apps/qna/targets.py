@@ -0,0 +1,40 @@
+from functools import cached_property
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Exists
+
+from .models import Answer, Comment, Post
+
+
+class CommentTarget:
+    """
+    A model which comments can be attached to through the generic relation.
+
+    The content type id is resolved once per process,
+    and the existence of the target is checked within the comment query itself.
+    """
+
+    def __init__(self, model):
+        self.model = model
+
+    @cached_property
+    def content_type_id(self):
+        return ContentType.objects.get_for_model(self.model).id
+
+    def exists(self, pk):
+        return self.model.objects.filter(pk=pk).exists()
+
+    def filter_comments(self, queryset, pk):
+        return queryset.filter(
+            Exists(self.model.objects.filter(pk=pk)),
+            content_type_id=self.content_type_id,
+            object_id=pk,
+        )
+
+
+# Looked up in this order when the target is given as query parameters.
+COMMENT_TARGETS = {
+    "answer": CommentTarget(Answer),
+    "comment": CommentTarget(Comment),
+    "post": CommentTarget(Post),
+}
@@ -0,0 +1,89 @@
+import threading
+from collections import defaultdict
+
+from snugg.cache import response_cache
+
+from .models import Field
+
+# Invalidated on every change of the tree. See 'signals.py'.
+FIELD_NAMESPACE = "qna:fields"
+
+
+class FieldSnapshot:
+    """
+    An immutable snapshot of the whole Field tree, loaded in a single query.
+    """
+
+    def __init__(self, fields):
+        self.by_pk = {}
+        self.by_name = defaultdict(list)
+        self.children = defaultdict(list)
+
+        # Ordered by the tree, the same names being listed in that order.
+        for field in fields:
+            self.by_pk[field.pk] = field
+            self.by_name[field.name.lower()].append(field)
+            self.children[field.parent_id].append(field)
+
+    def get(self, name):
+        """
+        The first field with the given name, if any.
+        """
+        fields = self.filter(name)
+        return fields[0] if fields else None
+
+    def filter(self, name):
+        """
+        All the fields with the given name, e.g. under different parents.
+        """
+        return self.by_name.get(name.lower(), [])
+
+    def as_tree(self, parent_id=None):
+        return [
+            {
+                "pk": field.pk,
+                "name": field.name,
+                "children": self.as_tree(field.pk),
+            }
+            for field in self.children[parent_id]
+        ]
+
+
+class FieldTree:
+    """
+    Process-local snapshot of the Field tree.
+
+    The tree is tiny and rarely changes, so names are resolved without any
+    SQL. The snapshot is tagged with the version of the 'qna:fields' response
+    cache namespace, which is bumped on every save, delete or move of a field,
+    so that the snapshots of all the processes are reloaded on the next access.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self.snapshot = None
+
+    def get_snapshot(self):
+        [version] = response_cache.get_versions([FIELD_NAMESPACE])
+
+        if version != self.version:
+            with self.lock:
+                if version != self.version:
+                    fields = Field.objects.order_by("tree_id", "lft")
+                    self.snapshot = FieldSnapshot(list(fields))
+                    self.version = version
+
+        return self.snapshot
+
+    def get(self, name):
+        return self.get_snapshot().get(name)
+
+    def filter(self, name):
+        return self.get_snapshot().filter(name)
+
+    def as_tree(self):
+        return self.get_snapshot().as_tree()
+
+
+field_tree = FieldTree()
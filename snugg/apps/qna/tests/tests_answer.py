@@ -6,7 +6,7 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 
 from ..models import Answer, Post
-from .factories import PostFactory, UserFactory
+from .factories import AnswerFactory, PostFactory, UserFactory
 
 fake = Faker()
 
@@ -68,3 +68,41 @@ class AnswerCreateTests(AnswerAPITestCase):
         response = self.create_answer(self.data)
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_answer_create_twice(self):
+        self.create_answer(self.data)
+
+        with self.assertNumQueries(5):
+            response = self.create_answer(self.data)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data.get("post"), ["이미 답변을 단 질문입니다."])
+        self.assertEqual(Answer.objects.filter(writer=self.user).count(), 1)
+
+    def test_answer_update_own(self):
+        answer = AnswerFactory(post=self.post, writer=self.user)
+        data = {**self.data, "content": fake.text()}
+        response = self.update_answer(answer.pk, data)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data.get("content"), data.get("content"))
+
+    def test_answer_update_accepted_moved(self):
+        answer = AnswerFactory(post=self.post, writer=self.user)
+        Post.objects.filter(pk=self.post.pk).update(accepted_answer=answer)
+        other_post = PostFactory()
+
+        response = self.partial_update_answer(answer.pk, {"post": other_post.pk})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data.get("post"), ["채택된 답변은 다른 질문으로 옮길 수 없습니다."])
+        answer.refresh_from_db()
+        self.assertEqual(answer.post_id, self.post.pk)
+
+    def test_answer_update_post_answered(self):
+        AnswerFactory(post=self.post, writer=self.user)
+        answer = AnswerFactory(writer=self.user)
+        response = self.partial_update_answer(answer.pk, {"post": self.post.pk})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data.get("post"), ["이미 답변을 단 질문입니다."])
@@ -0,0 +1,248 @@
+from django.core.cache import cache
+from django.urls import reverse
+from faker import Faker
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from snugg.cache import response_cache
+
+from .factories import AnswerFactory, CommentFactory, PostFactory, UserFactory
+
+fake = Faker()
+
+
+class ResponseCacheTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.post = PostFactory(writer=cls.user)
+        cls.answer = AnswerFactory(post=cls.post)
+        cls.comment = CommentFactory(content_object=cls.answer)
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, url, **params):
+        return self.client.get(url, params)
+
+    def assertCached(self, response, cached=True):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Cache"], "HIT" if cached else "MISS")
+
+    def test_post_list_cache(self):
+        url = reverse("qna-post-list")
+
+        self.assertCached(self.get(url), False)
+        with self.assertNumQueries(0):
+            self.assertCached(self.get(url))
+
+        # Query parameters are normalized.
+        self.assertCached(self.get(url, ordering="created_at", page_size=5), False)
+        self.assertCached(self.client.get(f"{url}?page_size=5&ordering=created_at"))
+
+        # Authentication state is a part of the key.
+        self.client.force_authenticate(user=self.user)
+        self.assertCached(self.get(url), False)
+
+    def test_post_cache_invalidation(self):
+        list_url = reverse("qna-post-list")
+        detail_url = reverse("qna-post-detail", args=[self.post.pk])
+        other_post = PostFactory()
+        other_url = reverse("qna-post-detail", args=[other_post.pk])
+
+        for url in (list_url, detail_url, other_url):
+            self.get(url)
+
+        self.post.title = fake.sentence(nb_words=4)
+        self.post.save()
+
+        response = self.get(detail_url)
+        self.assertCached(response, False)
+        self.assertEqual(response.data.get("title"), self.post.title)
+        self.assertCached(self.get(list_url), False)
+        self.assertCached(self.get(other_url))
+
+    def test_post_tags_invalidation(self):
+        detail_url = reverse("qna-post-detail", args=[self.post.pk])
+        self.get(detail_url)
+
+        self.post.tags.add("cached")
+
+        response = self.get(detail_url)
+        self.assertCached(response, False)
+        self.assertIn("cached", response.data.get("tags"))
+
+    def test_answer_invalidation(self):
+        detail_url = reverse("qna-post-detail", args=[self.post.pk])
+        discussion_url = reverse("qna-post-discussion", args=[self.post.pk])
+        answer_list_url = reverse("answer-list")
+
+        for url in (detail_url, discussion_url, answer_list_url):
+            self.get(url)
+
+        AnswerFactory(post=self.post)
+
+        response = self.get(detail_url)
+        self.assertCached(response, False)
+        self.assertEqual(response.data.get("answer_count"), 2)
+        self.assertCached(self.get(discussion_url), False)
+        self.assertCached(self.get(answer_list_url), False)
+
+    def test_reply_invalidation(self):
+        comment_url = reverse("comment-detail", args=[self.comment.pk])
+        discussion_url = reverse("qna-post-discussion", args=[self.post.pk])
+        post_list_url = reverse("qna-post-list")
+
+        for url in (comment_url, discussion_url, post_list_url):
+            self.get(url)
+
+        CommentFactory(content_object=self.comment)
+
+        response = self.get(comment_url)
+        self.assertCached(response, False)
+        self.assertEqual(response.data.get("replies_count"), 1)
+        self.assertCached(self.get(discussion_url), False)
+        self.assertCached(self.get(post_list_url))
+
+    def test_invalidation_after_commit(self):
+        detail_url = reverse("qna-post-detail", args=[self.post.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.tags.add("committed")
+            # A concurrent request caching the data read before the commit.
+            self.assertCached(self.get(detail_url), False)
+
+        response = self.get(detail_url)
+        self.assertCached(response, False)
+        self.assertIn("committed", response.data.get("tags"))
+
+    def test_cache_not_found(self):
+        url = reverse("qna-post-detail", args=[999])
+
+        self.assertEqual(self.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cache_metrics(self):
+        url = reverse("qna-post-list")
+        self.get(url)
+        self.get(url)
+        self.get(url)
+
+        metrics = response_cache.get_metrics().get("PostViewSet.list")
+        self.assertDictEqual(metrics, {"hit": 2, "miss": 1})
+
+
+class ConditionalGetTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.post = PostFactory()
+        cls.answer = AnswerFactory(post=cls.post)
+        cls.comment = CommentFactory(content_object=cls.post)
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, url, etag=None, **params):
+        if etag is None:
+            return self.client.get(url, params)
+        return self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+
+    def assertNotModified(self, url, etag, **params):
+        response = self.get(url, etag, **params)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def assertModified(self, url, etag, **params):
+        response = self.get(url, etag, **params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_retrieve_not_modified(self):
+        url = reverse("qna-post-detail", args=[self.post.pk])
+        response = self.get(url)
+
+        self.assertIn("ETag", response)
+        self.assertIn("Last-Modified", response)
+        self.assertNotModified(url, response["ETag"])
+
+        # Not modified since the last modification.
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_retrieve_not_modified_single_query(self):
+        url = reverse("answer-detail", args=[self.answer.pk])
+        etag = self.get(url)["ETag"]
+        cache.clear()
+
+        with self.assertNumQueries(1):
+            self.assertNotModified(url, etag)
+
+    def test_retrieve_malformed_pk(self):
+        response = self.get(reverse("qna-post-detail", args=["malformed"]))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_retrieve_modified(self):
+        url = reverse("qna-post-detail", args=[self.post.pk])
+        etag = self.get(url)["ETag"]
+
+        self.post.title = fake.sentence(nb_words=4)
+        self.post.save()
+
+        self.assertModified(url, etag)
+
+    def test_retrieve_tags_modified(self):
+        url = reverse("qna-post-detail", args=[self.post.pk])
+        etag = self.get(url)["ETag"]
+
+        self.post.tags.add("modified")
+
+        self.assertModified(url, etag)
+
+    def test_retrieve_counter_modified(self):
+        url = reverse("qna-post-detail", args=[self.post.pk])
+        etag = self.get(url)["ETag"]
+
+        # Counters are updated without touching 'updated_at'.
+        AnswerFactory(post=self.post)
+
+        self.assertModified(url, etag)
+
+    def test_list_not_modified(self):
+        url = reverse("comment-list")
+        etag = self.get(url, post=self.post.pk)["ETag"]
+        cache.clear()
+
+        with self.assertNumQueries(1):
+            self.assertNotModified(url, etag, post=self.post.pk)
+
+        # Another page of the same list.
+        self.assertModified(url, etag, post=self.post.pk, page_size=1)
+
+    def test_list_modified(self):
+        url = reverse("comment-list")
+        etag = self.get(url, post=self.post.pk)["ETag"]
+
+        comment = CommentFactory(content_object=self.post)
+        self.assertModified(url, etag, post=self.post.pk)
+
+        etag = self.get(url, post=self.post.pk)["ETag"]
+        comment.delete()
+        self.assertModified(url, etag, post=self.post.pk)
+
+    def test_list_reply_modified(self):
+        url = reverse("comment-list")
+        etag = self.get(url, post=self.post.pk)["ETag"]
+
+        CommentFactory(content_object=self.comment)
+
+        self.assertModified(url, etag, post=self.post.pk)
+
+    def test_cached_not_modified(self):
+        url = reverse("qna-post-list")
+        etag = self.get(url)["ETag"]
+
+        with self.assertNumQueries(0):
+            self.assertNotModified(url, etag)
@@ -2,6 +2,7 @@ from random import choice
 from urllib.parse import urlencode
 
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.urls import reverse
 from faker import Faker
 from rest_framework import status
@@ -38,6 +39,16 @@ class CommentAPITestCase(APITestCase):
     def destroy_comment(self, pk):
         return self.client.delete(reverse("comment-detail", args=[pk]))
 
+    def create_target_comment(self, target, pk, data):
+        return self.client.post(reverse(f"{target}-comment-list", args=[pk]), data)
+
+    def list_target_comment(self, target, pk, **params):
+        url = reverse(f"{target}-comment-list", args=[pk])
+        return self.client.get(f"{url}?{urlencode(params)}")
+
+    def list_comment_thread(self, **params):
+        return self.client.get(f"{reverse('comment-thread')}?{urlencode(params)}")
+
 
 class CommentCreateTests(CommentAPITestCase):
     @classmethod
@@ -129,6 +140,50 @@ class CommentReadTests(CommentAPITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_comment_list_target_wrong(self):
+        for target_pk in ("post", "-1", "²"):
+            response = self.list_comment(post=target_pk)
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_comment_list_replies_count(self):
+        post = PostFactory()
+        comments = CommentFactory.create_batch(3, content_object=post)
+        CommentFactory.create_batch(2, content_object=comments[0])
+        CommentFactory(content_object=comments[1])
+
+        response = self.list_comment(post=post.pk)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        replies_counts = {
+            result.get("pk"): result.get("replies_count")
+            for result in response.data.get("results")
+        }
+        self.assertDictEqual(
+            replies_counts, {comments[0].pk: 2, comments[1].pk: 1, comments[2].pk: 0}
+        )
+
+        response = self.retrieve_comment(comments[0].pk)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data.get("replies_count"), 2)
+
+    def test_comment_list_num_queries(self):
+        post = PostFactory()
+        for comment in CommentFactory.create_batch(10, content_object=post):
+            CommentFactory.create_batch(2, content_object=comment)
+
+        # Warm up the content type cache, but not the response cache.
+        self.list_comment(post=post.pk)
+        cache.clear()
+
+        # The validators of the list and the page itself.
+        for page_size in (1, 5, 10):
+            with self.assertNumQueries(2):
+                response = self.list_comment(post=post.pk, page_size=page_size)
+
+            self.assertEqual(len(response.data.get("results")), page_size)
+
 
 class CommentUpdateTests(CommentAPITestCase):
     @classmethod
@@ -151,3 +206,136 @@ class CommentUpdateTests(CommentAPITestCase):
         self.assertEqual(response.data.get("writer").get("pk"), self.user.pk)
 
         self.assertEqual(response.data.get("content"), self.data.get("content"))
+
+
+class CommentThreadTests(CommentAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.post = PostFactory()
+        cls.answer = AnswerFactory(post=cls.post)
+        cls.comments = CommentFactory.create_batch(15, content_object=cls.post)
+        cls.replies = CommentFactory.create_batch(3, content_object=cls.comments[-1])
+        cls.answer_comment = CommentFactory(content_object=cls.answer)
+
+    def test_comment_thread(self):
+        response = self.list_comment_thread(post=self.post.pk)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data.get("results")
+        self.assertEqual(len(results), 10)
+
+        latest = results[0]
+        self.assertEqual(latest.get("pk"), self.comments[-1].pk)
+        self.assertEqual(latest.get("replies_count"), 3)
+        self.assertListEqual(
+            [reply.get("pk") for reply in latest.get("replies")],
+            [reply.pk for reply in self.replies],
+        )
+
+        for result in results[1:]:
+            self.assertListEqual(result.get("replies"), [])
+
+        response = self.client.get(response.data.get("next"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data.get("results")), 5)
+
+    def test_comment_thread_answer(self):
+        response = self.list_comment_thread(answer=self.answer.pk)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result_pks = [result.get("pk") for result in response.data.get("results")]
+        self.assertListEqual(result_pks, [self.answer_comment.pk])
+
+    def test_comment_thread_num_queries(self):
+        self.list_comment_thread(post=self.post.pk)
+        cache.clear()
+
+        with self.assertNumQueries(2):
+            response = self.list_comment_thread(post=self.post.pk, page_size=15)
+
+        self.assertEqual(len(response.data.get("results")), 15)
+
+    def test_comment_thread_wrong(self):
+        response = self.list_comment_thread()
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        for target_pk in ("post", "²"):
+            response = self.list_comment_thread(post=target_pk)
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.list_comment_thread(post=999)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class CommentNestedRouteTests(CommentAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.post = PostFactory()
+        cls.answer = AnswerFactory(post=cls.post)
+        cls.post_comments = CommentFactory.create_batch(3, content_object=cls.post)
+        cls.answer_comments = CommentFactory.create_batch(2, content_object=cls.answer)
+
+        cls.data = {
+            "content": fake.text(),
+        }
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+
+    def test_post_comment_list(self):
+        response = self.list_target_comment("qna-post", self.post.pk)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result_pks = [result.get("pk") for result in response.data.get("results")]
+        self.assertCountEqual(result_pks, [c.pk for c in self.post_comments])
+
+    def test_answer_comment_list(self):
+        response = self.list_target_comment("answer", self.answer.pk)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result_pks = [result.get("pk") for result in response.data.get("results")]
+        self.assertCountEqual(result_pks, [c.pk for c in self.answer_comments])
+
+    def test_comment_list_not_found(self):
+        response = self.list_target_comment("qna-post", 999)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        # Comments left behind by a deleted target are not listed either.
+        answer_pk = self.answer.pk
+        Answer.objects.filter(pk=answer_pk).delete()
+        Comment.objects.create(
+            writer=self.user,
+            content=fake.text(),
+            content_type=ContentType.objects.get_for_model(Answer),
+            object_id=answer_pk,
+        )
+        response = self.list_target_comment("answer", answer_pk)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_post_comment_create(self):
+        response = self.create_target_comment("qna-post", self.post.pk, self.data)
+        comment = Comment.objects.last()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(comment.content_type, ContentType.objects.get_for_model(Post))
+        self.assertEqual(comment.object_id, self.post.pk)
+
+        response = self.create_target_comment("qna-post", 999, self.data)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_comment_create_target_missing(self):
+        response = self.create_comment(self.data)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.create_comment(self.data, post="post")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,106 @@
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..models import Field
+from ..taxonomy import field_tree
+from .factories import FieldFactory, PostFactory
+
+
+class FieldTreeTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.science = FieldFactory(name="Science")
+        cls.physics = FieldFactory(name="Physics", parent=cls.science)
+        cls.optics = FieldFactory(name="Optics", parent=cls.physics)
+        cls.arts = FieldFactory(name="Arts")
+
+    def setUp(self):
+        # The snapshot outlives the rollbacks of the previous tests.
+        cache.clear()
+
+    def list_post(self, **params):
+        return self.client.get(f"{reverse('qna-post-list')}?{urlencode(params)}")
+
+    def test_field_lookup_without_query(self):
+        field_tree.get("science")
+
+        with self.assertNumQueries(0):
+            self.assertEqual(field_tree.get("PHYSICS").pk, self.physics.pk)
+            self.assertIsNone(field_tree.get("chemistry"))
+
+    def test_field_lookup_invalidation(self):
+        field_tree.get("science")
+
+        chemistry = FieldFactory(name="Chemistry", parent=self.science)
+        self.assertEqual(field_tree.get("chemistry").pk, chemistry.pk)
+
+        chemistry.name = "Biology"
+        chemistry.save()
+        self.assertIsNone(field_tree.get("chemistry"))
+        self.assertEqual(field_tree.get("biology").pk, chemistry.pk)
+
+        chemistry.delete()
+        self.assertIsNone(field_tree.get("biology"))
+
+    def test_field_move_invalidation(self):
+        field_tree.get("science")
+
+        self.physics.move_to(self.arts)
+        self.assertEqual(field_tree.get("optics").tree_id, self.arts.tree_id)
+
+    def test_post_filter_field_tree(self):
+        posts = {
+            field.pk: PostFactory(field=field)
+            for field in (self.science, self.physics, self.optics, self.arts)
+        }
+
+        response = self.list_post(field_tree="physics")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result_pks = [result.get("pk") for result in response.data.get("results")]
+        self.assertCountEqual(
+            result_pks, [posts[self.physics.pk].pk, posts[self.optics.pk].pk]
+        )
+
+        response = self.list_post(field="physics")
+
+        result_pks = [result.get("pk") for result in response.data.get("results")]
+        self.assertListEqual(result_pks, [posts[self.physics.pk].pk])
+
+        response = self.list_post(field_tree="chemistry")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual(response.data.get("results"), [])
+
+    def test_post_filter_same_names(self):
+        optics = FieldFactory(name="Optics", parent=self.arts)
+        lens = FieldFactory(name="Lens", parent=optics)
+        posts = [PostFactory(field=field) for field in (self.optics, optics, lens)]
+
+        response = self.list_post(field="optics")
+
+        result_pks = [result.get("pk") for result in response.data.get("results")]
+        self.assertCountEqual(result_pks, [posts[0].pk, posts[1].pk])
+
+        response = self.list_post(field_tree="optics")
+
+        result_pks = [result.get("pk") for result in response.data.get("results")]
+        self.assertCountEqual(result_pks, [post.pk for post in posts])
+
+    def test_field_list(self):
+        response = self.client.get(reverse("qna-field-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), Field.objects.root_nodes().count())
+
+        science = next(
+            node for node in response.data if node.get("pk") == self.science.pk
+        )
+        self.assertEqual(science.get("name"), "Science")
+        [physics] = science.get("children")
+        self.assertEqual(physics.get("pk"), self.physics.pk)
+        self.assertEqual(physics.get("children")[0].get("name"), "Optics")
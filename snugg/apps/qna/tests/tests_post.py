@@ -1,13 +1,25 @@
+from io import StringIO
 from random import choice
 from urllib.parse import urlencode
 
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from faker import Faker
 from rest_framework import status
 from rest_framework.test import APITestCase
+from taggit.models import Tag
 
 from ..models import Post
-from .factories import AnswerFactory, FieldFactory, PostFactory, UserFactory
+from .factories import (
+    AnswerFactory,
+    CommentFactory,
+    FieldFactory,
+    PostFactory,
+    UserFactory,
+)
 
 fake = Faker()
 
@@ -35,6 +47,14 @@ class PostAPITestCase(APITestCase):
     def destroy_post(self, pk):
         return self.client.delete(reverse("qna-post-detail", args=[pk]))
 
+    def retrieve_post_discussion(self, pk):
+        return self.client.get(reverse("qna-post-discussion", args=[pk]))
+
+    def accept_answer(self, pk, answer_pk):
+        return self.client.post(
+            reverse("qna-post-accept", args=[pk]), {"answer": answer_pk}
+        )
+
 
 class PostCreateTests(PostAPITestCase):
     @classmethod
@@ -216,6 +236,39 @@ class PostReadTests(PostAPITestCase):
         for result in response.data.get("results"):
             self.assertEqual(result.get("writer").get("pk"), writer_pk)
 
+    def test_post_list_search(self):
+        title_post = PostFactory(title="장고 검색 엔진", content=fake.text())
+        content_post = PostFactory(title=fake.sentence(), content="검색 엔진 장고")
+
+        response = self.list_post(search="검색 엔진")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result_pks = [result.get("pk") for result in response.data.get("results")]
+        self.assertCountEqual(result_pks, [title_post.pk, content_post.pk])
+
+        response = self.list_post(search="검색 엔진", search_type="title")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result_pks = [result.get("pk") for result in response.data.get("results")]
+        self.assertListEqual(result_pks, [title_post.pk])
+
+        response = self.list_post(search="장고", ordering="-search_rank")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result_pks = [result.get("pk") for result in response.data.get("results")]
+        self.assertListEqual(result_pks, [title_post.pk, content_post.pk])
+
+    def test_post_list_search_updated(self):
+        post = choice(self.posts)
+        post.title = "갱신된 제목"
+        post.save()
+
+        response = self.list_post(search="갱신된")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result_pks = [result.get("pk") for result in response.data.get("results")]
+        self.assertListEqual(result_pks, [post.pk])
+
     def test_post_list_ordering(self):
         response = self.list_post(ordering="-created_at")
 
@@ -480,3 +533,346 @@ class PostDeleteTests(PostAPITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
         self.assertEqual(Post.objects.count(), 1)
+
+
+class PostCounterTests(PostAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.post = PostFactory(writer=cls.user)
+        cls.answers = AnswerFactory.create_batch(3, post=cls.post)
+        cls.comments = CommentFactory.create_batch(2, content_object=cls.post)
+        CommentFactory(content_object=cls.answers[0])
+        CommentFactory(content_object=cls.comments[0])
+
+    def test_post_counters(self):
+        response = self.retrieve_post(self.post.pk)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data.get("answer_count"), 3)
+        self.assertEqual(response.data.get("comment_count"), 2)
+
+    def test_post_counters_delete(self):
+        self.answers[0].delete()
+        self.comments[0].delete()
+        self.post.refresh_from_db()
+
+        self.assertEqual(self.post.answer_count, 2)
+        self.assertEqual(self.post.comment_count, 1)
+
+    def test_post_counters_not_overwritten(self):
+        post = Post.objects.get(pk=self.post.pk)
+        AnswerFactory(post=post)
+
+        post.title = fake.sentence(nb_words=4)
+        post.save()
+        post.refresh_from_db()
+
+        self.assertEqual(post.answer_count, 4)
+
+    def test_post_counters_read_only(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.partial_update_post(self.post.pk, {"answer_count": 100})
+        self.post.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.post.answer_count, 3)
+
+    def test_post_list_ordering_counters(self):
+        other_post = PostFactory()
+        AnswerFactory.create_batch(5, post=other_post)
+
+        response = self.list_post(ordering="-answer_count")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result_pks = [result.get("pk") for result in response.data.get("results")]
+        self.assertListEqual(result_pks[:2], [other_post.pk, self.post.pk])
+
+    def test_reconcile_post_counters(self):
+        Post.objects.filter(pk=self.post.pk).update(answer_count=0, comment_count=9)
+
+        call_command("reconcile_post_counters", batch_size=1, stdout=StringIO())
+        self.post.refresh_from_db()
+
+        self.assertEqual(self.post.answer_count, 3)
+        self.assertEqual(self.post.comment_count, 2)
+
+
+class PostAcceptTests(PostAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.post = PostFactory(writer=cls.user)
+        cls.answer = AnswerFactory(post=cls.post)
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+
+    def test_post_accept(self):
+        with self.assertNumQueries(1):
+            response = self.accept_answer(self.post.pk, self.answer.pk)
+        self.post.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.post.accepted_answer, self.answer)
+
+        response = self.retrieve_post(self.post.pk)
+        self.assertEqual(response.data.get("accepted_answer"), self.answer.pk)
+
+    def test_post_accept_twice(self):
+        self.accept_answer(self.post.pk, self.answer.pk)
+        response = self.accept_answer(self.post.pk, AnswerFactory(post=self.post).pk)
+        self.post.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.post.accepted_answer, self.answer)
+
+    def test_post_accept_answer_wrong(self):
+        for answer in (
+            AnswerFactory(),
+            AnswerFactory(post=self.post, writer=self.user),
+        ):
+            response = self.accept_answer(self.post.pk, answer.pk)
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.post.refresh_from_db()
+        self.assertIsNone(self.post.accepted_answer)
+
+    def test_post_accept_not_writer(self):
+        self.client.force_authenticate(user=UserFactory())
+        response = self.accept_answer(self.post.pk, self.answer.pk)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_post_accept_not_found(self):
+        for pk in (self.post.pk + 1000, "post", "²"):
+            response = self.accept_answer(pk, self.answer.pk)
+
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_post_accept_unauthorized(self):
+        self.client.force_authenticate(user=None)
+        response = self.accept_answer(self.post.pk, self.answer.pk)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_post_accepted_answer_constraint(self):
+        other_answer = AnswerFactory()
+
+        with self.assertRaises(IntegrityError):
+            with transaction.atomic():
+                posts = Post.objects.filter(pk=self.post.pk)
+                posts.update(accepted_answer=other_answer)
+                connection.check_constraints()
+
+
+class PostExcerptTests(PostAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.post = PostFactory(
+            writer=cls.user,
+            content="# 제목\n\n<p>Hello &amp; **world**, my_var [link](https://snugg.io)</p>",
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_post_excerpt(self):
+        self.assertEqual(self.post.excerpt, "제목 Hello & world, my_var link")
+
+        self.post.content = "가" * 200
+        self.post.save(update_fields=["content"])
+        self.post.refresh_from_db()
+
+        self.assertEqual(len(self.post.excerpt), 120)
+        self.assertTrue(self.post.excerpt.endswith("…"))
+
+    def test_post_excerpt_updated(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.partial_update_post(self.post.pk, {"content": "*updated*"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data.get("excerpt"), "updated")
+
+    def test_post_excerpt_read_only(self):
+        self.client.force_authenticate(user=self.user)
+        self.partial_update_post(self.post.pk, {"excerpt": "wrong"})
+        self.post.refresh_from_db()
+
+        self.assertEqual(self.post.excerpt, "제목 Hello & world, my_var link")
+
+    def test_post_list_compact(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.list_post(compact="true")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result = response.data.get("results")[0]
+        self.assertNotIn("content", result)
+        self.assertEqual(result.get("excerpt"), self.post.excerpt)
+        self.assertFalse(any('"content"' in query["sql"] for query in context))
+
+    def test_backfill_excerpts(self):
+        Post.objects.filter(pk=self.post.pk).update(excerpt="")
+
+        call_command("backfill_excerpts", chunk_size=1, stdout=StringIO())
+        self.post.refresh_from_db()
+
+        self.assertEqual(self.post.excerpt, "제목 Hello & world, my_var link")
+
+
+class PostTagTests(PostAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.django_post = PostFactory(tags=["Django", "Python"])
+        cls.flask_post = PostFactory(tags=["Flask", "Python"])
+        cls.other_post = PostFactory(tags=["Spring"])
+
+    def list_result_pks(self, **params):
+        response = self.list_post(**params)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [result.get("pk") for result in response.data.get("results")]
+
+    def test_post_tag_names(self):
+        self.django_post.refresh_from_db()
+        self.assertListEqual(self.django_post.tag_names, ["django", "python"])
+
+        self.django_post.tags.remove("Python")
+        self.django_post.tags.add("ORM")
+        self.django_post.refresh_from_db()
+        self.assertListEqual(self.django_post.tag_names, ["django", "orm"])
+
+        self.django_post.tags.clear()
+        self.django_post.refresh_from_db()
+        self.assertListEqual(self.django_post.tag_names, [])
+
+    def test_post_tag_names_not_overwritten(self):
+        post = Post.objects.get(pk=self.flask_post.pk)
+        self.flask_post.tags.add("Web")
+
+        post.title = fake.sentence(nb_words=4)
+        post.save()
+        post.refresh_from_db()
+
+        self.assertListEqual(post.tag_names, ["flask", "python", "web"])
+
+    def test_post_tag_names_deleted_tag(self):
+        Tag.objects.get(name__iexact="python").delete()
+
+        self.flask_post.refresh_from_db()
+        self.assertListEqual(self.flask_post.tag_names, ["flask"])
+
+    def test_post_set_tags(self):
+        tag_count = Tag.objects.count()
+        self.django_post.set_tags(["PYTHON", "Web", "web", "ORM"])
+
+        self.assertEqual(Tag.objects.count(), tag_count + 2)
+        self.assertCountEqual(self.django_post.tags.names(), ["Python", "Web", "ORM"])
+        self.django_post.refresh_from_db()
+        self.assertListEqual(self.django_post.tag_names, ["orm", "python", "web"])
+
+    def test_post_set_tags_num_queries(self):
+        def count_queries(names):
+            post = PostFactory(tags=["Django"])
+            with CaptureQueriesContext(connection) as context:
+                post.set_tags(names)
+
+            return len(context.captured_queries)
+
+        self.assertEqual(
+            count_queries([fake.unique.word() for _ in range(2)]),
+            count_queries([fake.unique.word() for _ in range(8)]),
+        )
+
+    def test_post_update_tags(self):
+        self.client.force_authenticate(user=self.django_post.writer)
+        response = self.partial_update_post(
+            self.django_post.pk, {"tags": ["django", "Async"]}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertCountEqual(response.data.get("tags"), ["Django", "Async"])
+        self.assertCountEqual(
+            self.list_result_pks(tags_all="async"), [self.django_post.pk]
+        )
+
+    def test_post_list_filter_tags(self):
+        self.assertCountEqual(
+            self.list_result_pks(tag="PYTHON"),
+            [self.django_post.pk, self.flask_post.pk],
+        )
+        self.assertCountEqual(
+            self.list_result_pks(tags_any="django,spring"),
+            [self.django_post.pk, self.other_post.pk],
+        )
+        self.assertListEqual(
+            self.list_result_pks(tags_all="python, flask"), [self.flask_post.pk]
+        )
+        self.assertListEqual(self.list_result_pks(tags_all="django,flask"), [])
+
+
+class PostDiscussionTests(PostAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.post = PostFactory()
+        cls.answers = AnswerFactory.create_batch(3, post=cls.post)
+        cls.post.accepted_answer = cls.answers[1]
+        cls.post.save()
+
+        cls.post_comments = CommentFactory.create_batch(2, content_object=cls.post)
+        cls.answer_comments = CommentFactory.create_batch(
+            2, content_object=cls.answers[0]
+        )
+        cls.replies = CommentFactory.create_batch(
+            2, content_object=cls.answer_comments[0]
+        )
+
+    def test_post_discussion(self):
+        response = self.retrieve_post_discussion(self.post.pk)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data.get("post").get("pk"), self.post.pk)
+        self.assertListEqual(
+            [comment.get("pk") for comment in response.data.get("comments")],
+            [comment.pk for comment in self.post_comments],
+        )
+
+        answers = response.data.get("answers")
+        self.assertListEqual(
+            [answer.get("pk") for answer in answers],
+            [self.answers[1].pk, self.answers[0].pk, self.answers[2].pk],
+        )
+        self.assertListEqual(answers[0].get("comments"), [])
+
+        comments = answers[1].get("comments")
+        self.assertListEqual(
+            [comment.get("pk") for comment in comments],
+            [comment.pk for comment in self.answer_comments],
+        )
+        self.assertEqual(comments[0].get("replies_count"), 2)
+        self.assertListEqual(
+            [reply.get("pk") for reply in comments[0].get("replies")],
+            [reply.pk for reply in self.replies],
+        )
+
+    def test_post_discussion_num_queries(self):
+        self.retrieve_post_discussion(self.post.pk)
+        cache.clear()
+
+        with self.assertNumQueries(5):
+            self.retrieve_post_discussion(self.post.pk)
+
+        for answer in AnswerFactory.create_batch(5, post=self.post):
+            CommentFactory(content_object=answer)
+
+        with self.assertNumQueries(5):
+            response = self.retrieve_post_discussion(self.post.pk)
+
+        self.assertEqual(len(response.data.get("answers")), 8)
+
+    def test_post_discussion_not_found(self):
+        response = self.retrieve_post_discussion(999)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
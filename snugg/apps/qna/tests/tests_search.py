@@ -0,0 +1,141 @@
+from io import StringIO
+from urllib.parse import urlencode
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..models import Answer, Post, SearchTerm
+from ..tokenizers import index_ngrams, ngrams, query_ngrams
+from .factories import AnswerFactory, PostFactory
+
+
+class NgramTests(TestCase):
+    def test_ngrams(self):
+        self.assertSetEqual(ngrams("장고를 써요"), {"장고", "고를", "써요"})
+
+    def test_ngrams_non_hangul(self):
+        self.assertSetEqual(ngrams("django 3.2 검색"), {"검색"})
+        self.assertSetEqual(ngrams("django"), set())
+
+    def test_ngrams_short(self):
+        self.assertSetEqual(ngrams("책 한 권"), set())
+        self.assertSetEqual(ngrams("파이썬", n=3), {"파이썬"})
+
+    def test_index_ngrams(self):
+        self.assertSetEqual(index_ngrams("장고를 써요"), {"장고", "고를", "장고를", "써요"})
+
+    def test_query_ngrams(self):
+        # The trigrams of the long runs, the bigrams of the others.
+        self.assertSetEqual(query_ngrams("장고를"), {"장고를"})
+        self.assertSetEqual(query_ngrams("검색엔진"), {"검색엔", "색엔진"})
+        self.assertSetEqual(query_ngrams("장고 django 검색엔"), {"장고", "검색엔"})
+        self.assertSetEqual(query_ngrams("책"), set())
+
+
+class SearchTermTests(TestCase):
+    def test_index_on_save(self):
+        post = PostFactory(title="장고", content="검색")
+
+        self.assertSetEqual(SearchTerm.objects.lookup(Post, {"장고"}), {post.pk})
+        self.assertSetEqual(SearchTerm.objects.lookup(Post, {"검색"}), {post.pk})
+
+        post.title = "파이썬"
+        post.save()
+
+        self.assertSetEqual(SearchTerm.objects.lookup(Post, {"장고"}), set())
+        self.assertSetEqual(SearchTerm.objects.lookup(Post, {"파이"}), {post.pk})
+
+    def test_intersection_in_database(self):
+        post = PostFactory(title="장고 검색")
+        PostFactory(title="장고")
+        queryset = Post.objects.filter(
+            pk__in=SearchTerm.objects.intersection(Post, {"장고", "검색"})
+        )
+
+        self.assertIn("HAVING", str(queryset.query))
+        self.assertListEqual(list(queryset.values_list("pk", flat=True)), [post.pk])
+
+    def test_index_changes_only(self):
+        post = PostFactory(title="장고", content="검색")
+        other_post = PostFactory(title="장고", content="검색")
+        kept = set(SearchTerm.objects.filter(term="검색").values_list("pk", flat=True))
+        post.title = "파이썬"
+
+        with CaptureQueriesContext(connection) as context:
+            post.save()
+
+        # Neither the postings of the other objects nor the kept ones are touched.
+        queries = [
+            query["sql"] for query in context if "qna_searchterm" in query["sql"]
+        ]
+        self.assertFalse(any("FOR UPDATE" in sql for sql in queries))
+        self.assertFalse(any(sql.startswith("UPDATE") for sql in queries))
+        self.assertSetEqual(
+            set(SearchTerm.objects.filter(term="검색").values_list("pk", flat=True)),
+            kept,
+        )
+        self.assertSetEqual(SearchTerm.objects.lookup(Post, {"장고"}), {other_post.pk})
+        self.assertSetEqual(SearchTerm.objects.lookup(Post, {"파이썬"}), {post.pk})
+
+    def test_unindex_on_delete(self):
+        answer = AnswerFactory(content="장고 검색")
+        answer.delete()
+
+        self.assertSetEqual(SearchTerm.objects.lookup(Answer, {"장고"}), set())
+
+    def test_rebuild(self):
+        posts = PostFactory.create_batch(3, title="장고 검색")
+        SearchTerm.objects.all().delete()
+
+        call_command("rebuild_search_index", stdout=StringIO())
+
+        self.assertSetEqual(
+            SearchTerm.objects.lookup(Post, {"장고", "검색"}),
+            {post.pk for post in posts},
+        )
+
+
+class NgramSearchTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.post = PostFactory(title="장고검색엔진을 써봤습니다", content="내용")
+        cls.other_post = PostFactory(title="검색 엔진", content="장고는 어렵네요")
+        cls.answer = AnswerFactory(post=cls.post, content="검색엔진은 역시 장고죠")
+
+    def list_post(self, **params):
+        return self.client.get(f"{reverse('qna-post-list')}?{urlencode(params)}")
+
+    def list_answer(self, **params):
+        return self.client.get(f"{reverse('answer-list')}?{urlencode(params)}")
+
+    def test_post_search_substring(self):
+        response = self.list_post(search="검색엔진")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result_pks = [result.get("pk") for result in response.data.get("results")]
+        self.assertListEqual(result_pks, [self.post.pk])
+
+    def test_post_search_multiple_terms(self):
+        response = self.list_post(search="장고 엔진")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result_pks = [result.get("pk") for result in response.data.get("results")]
+        self.assertCountEqual(result_pks, [self.post.pk, self.other_post.pk])
+
+        response = self.list_post(search="장고 엔진", search_type="title")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result_pks = [result.get("pk") for result in response.data.get("results")]
+        self.assertListEqual(result_pks, [self.post.pk])
+
+    def test_answer_search_substring(self):
+        response = self.list_answer(search="장고죠")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result_pks = [result.get("pk") for result in response.data.get("results")]
+        self.assertListEqual(result_pks, [self.answer.pk])
@@ -0,0 +1,72 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .factories import AnswerFactory, CommentFactory, PostFactory
+
+
+class SparseFieldsTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.post = PostFactory(tags=["django"])
+        cls.answer = AnswerFactory(post=cls.post)
+        CommentFactory(content_object=cls.post)
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, url, column, **params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(any(column in query["sql"] for query in context))
+
+        return response
+
+    def test_post_list(self):
+        response = self.get(
+            reverse("qna-post-list"), '"qna_post"."content"', fields="pk,title,tags"
+        )
+
+        self.assertEqual(list(response.data.get("results")[0]), ["pk", "title", "tags"])
+        self.assertEqual(response.data.get("results")[0]["tags"], ["django"])
+
+    def test_post_retrieve(self):
+        url = reverse("qna-post-detail", args=[self.post.pk])
+        response = self.get(url, '"qna_post"."content"', fields="title")
+
+        self.assertEqual(response.data, {"title": self.post.title})
+
+    def test_answer_list(self):
+        response = self.get(
+            reverse("answer-list"), '"qna_answer"."content"', fields="pk,post"
+        )
+
+        self.assertEqual(
+            response.data.get("results"),
+            [{"pk": self.answer.pk, "post": self.post.pk}],
+        )
+
+    def test_comment_list(self):
+        response = self.get(
+            reverse("comment-list"),
+            '"qna_comment"."content"',
+            post=self.post.pk,
+            fields="pk,writer",
+        )
+
+        self.assertEqual(list(response.data.get("results")[0]), ["pk", "writer"])
+
+    def test_all_fields(self):
+        response = self.client.get(reverse("qna-post-list"), {"fields": ""})
+
+        self.assertIn("content", response.data.get("results")[0])
+
+    def test_unknown_fields(self):
+        response = self.client.get(reverse("qna-post-list"), {"fields": "pk,nothing"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
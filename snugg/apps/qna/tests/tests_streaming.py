@@ -0,0 +1,105 @@
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from snugg.renderers import FastJSONRenderer
+
+from ..serializers import PostSerializer
+from ..views import CommentViewSet, PostViewSet
+from .factories import CommentFactory, PostFactory
+
+
+class FastJSONRendererTests(APITestCase):
+    def test_same_output(self):
+        data = {
+            "datetime": datetime(2022, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+            "decimal": Decimal("1.5"),
+            "lazy": gettext_lazy("한국어"),
+            "nested": [{"none": None, "bool": True, 1: "key"}],
+        }
+
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_line_separators(self):
+        post = PostFactory(content="첫 줄\u2028둘째 줄\u2029셋째 줄")
+        data = PostSerializer(post).data
+        rendered = FastJSONRenderer().render(data)
+
+        self.assertEqual(rendered, JSONRenderer().render(data))
+        self.assertIn(b"\\u2028", rendered)
+
+    def test_render_stream(self):
+        renderer = FastJSONRenderer()
+        renderer.chunk_size = 1
+        data = {
+            "next": None,
+            "results": iter([{"pk": 1}, {"pk": 2}]),
+            "empty": iter([]),
+        }
+
+        chunks = list(renderer.render_stream(data))
+
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(
+            b"".join(chunks), b'{"next":null,"results":[{"pk":1},{"pk":2}],"empty":[]}'
+        )
+
+
+class StreamingListTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.post = PostFactory(tags=["django"])
+        PostFactory.create_batch(4)
+        CommentFactory.create_batch(5, content_object=cls.post)
+
+    def setUp(self):
+        cache.clear()
+
+    def assertStreamed(self, viewset, url, params):
+        with mock.patch.object(viewset, "stream_page_size", 2):
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/json")
+        streamed = b"".join(response.streaming_content)
+
+        cache.clear()
+        response = self.client.get(url, params)
+        self.assertFalse(response.streaming)
+
+        self.assertEqual(streamed, response.content)
+        self.assertEqual(len(json.loads(streamed)["results"]), 4)
+
+    def test_post_list(self):
+        self.assertStreamed(PostViewSet, reverse("qna-post-list"), {"page_size": 4})
+
+    def test_comment_list(self):
+        self.assertStreamed(
+            CommentViewSet,
+            reverse("comment-list"),
+            {"post": self.post.pk, "page_size": 4},
+        )
+
+    def test_streamed_list_not_cached(self):
+        url = reverse("qna-post-list")
+
+        with mock.patch.object(PostViewSet, "stream_page_size", 2):
+            for _ in range(2):
+                response = self.client.get(url, {"page_size": 4})
+                self.assertEqual(response["X-Cache"], "MISS")
+
+    def test_max_page_size(self):
+        url = reverse("qna-post-list")
+
+        with mock.patch.object(PostViewSet.pagination_class, "max_page_size", 2):
+            response = self.client.get(url, {"page_size": 1000})
+
+        self.assertEqual(len(response.data.get("results")), 2)
@@ -0,0 +1,79 @@
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..models import TagStat
+from .factories import PostFactory
+
+
+class TagStatTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.posts = [
+            PostFactory(tags=["Django", "Python"]),
+            PostFactory(tags=["django", "장고"]),
+            PostFactory(tags=["Python", "장난감"]),
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def list_tag(self, **params):
+        return self.client.get(f"{reverse('qna-tag-list')}?{urlencode(params)}")
+
+    def get_counts(self):
+        return dict(TagStat.objects.filter(count__gt=0).values_list("name", "count"))
+
+    def test_tag_counts(self):
+        self.assertDictEqual(
+            self.get_counts(), {"django": 2, "python": 2, "장고": 1, "장난감": 1}
+        )
+
+    def test_tag_counts_updated(self):
+        self.posts[0].tags.remove("Python")
+        self.posts[1].tags.add("Python")
+        self.posts[2].delete()
+
+        self.assertDictEqual(self.get_counts(), {"django": 2, "python": 1, "장고": 1})
+
+    def test_tag_list_popular(self):
+        self.posts[2].tags.add("django")
+        response = self.list_tag(limit=2)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual(
+            response.data,
+            [{"name": "django", "count": 3}, {"name": "python", "count": 2}],
+        )
+
+        with self.assertNumQueries(0):
+            self.list_tag(limit=2)
+
+    def test_tag_list_prefix(self):
+        response = self.list_tag(prefix="장")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual([tag.get("name") for tag in response.data], ["장고", "장난감"])
+
+        response = self.list_tag(prefix="DJ")
+
+        self.assertListEqual([tag.get("name") for tag in response.data], ["django"])
+
+    def test_tag_list_invalidated(self):
+        self.list_tag(prefix="py")
+        PostFactory(tags=["PyPy"])
+
+        response = self.list_tag(prefix="py")
+
+        self.assertListEqual(
+            [tag.get("name") for tag in response.data], ["python", "pypy"]
+        )
+
+    def test_tag_list_limit_wrong(self):
+        for limit in ("many", "-1", "²"):
+            response = self.list_tag(limit=limit)
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,103 @@
+import tempfile
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from snugg.apps.agora.models import Lecture, Semester, Story
+from snugg.apps.agora.serializers import StorySerializer, StoryValuesSerializer
+from snugg.apps.univ.models import University
+
+from ..models import Answer, Post
+from ..serializers import (
+    AnswerSerializer,
+    AnswerValuesSerializer,
+    PostSerializer,
+    PostValuesSerializer,
+)
+from .factories import AnswerFactory, PostFactory
+
+
+class ValuesSerializerTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.posts = PostFactory.create_batch(3, tags=["django", "장고"])
+        cls.posts.append(PostFactory(field=None, writer=None, tags=[]))
+        cls.posts[0].accepted_answer = AnswerFactory(post=cls.posts[0])
+        cls.posts[0].save()
+        AnswerFactory(post=cls.posts[1], writer=None)
+
+    def assertSameOutput(self, queryset, serializer_class, values_serializer_class):
+        rows = queryset.values(*values_serializer_class.get_paths())
+
+        self.assertEqual(
+            JSONRenderer().render(values_serializer_class.to_representation(rows)),
+            JSONRenderer().render(serializer_class(queryset, many=True).data),
+        )
+
+    def test_post_values(self):
+        queryset = Post.objects.order_by("pk")
+
+        self.assertSameOutput(queryset, PostSerializer, PostValuesSerializer)
+
+    def test_answer_values(self):
+        queryset = Answer.objects.order_by("pk")
+
+        self.assertSameOutput(queryset, AnswerSerializer, AnswerValuesSerializer)
+
+    def test_story_values(self):
+        university = University.objects.create(name="서울대학교")
+        lectures = [
+            Lecture.objects.create(
+                name="자료구조",
+                lecture_id="4190.101",
+                instructor="김",
+                university=university,
+            ),
+            Lecture.objects.create(name="미적분", lecture_id="033.011", instructor="이"),
+        ]
+        lectures[0].semesters.add(
+            Semester.objects.create(year=2021, season=4),
+            Semester.objects.create(year=2022, season=2),
+        )
+        for lecture in lectures:
+            Story.objects.create(
+                lecture=lecture, writer=self.posts[0].writer, title="제목", content="내용"
+            )
+        Story.objects.create(
+            lecture=lectures[0],
+            writer=self.posts[1].writer,
+            title="<b>제목</b>",
+            content="**내용**",
+        )
+        queryset = Story.objects.order_by("pk")
+
+        # The lectures are read from a catalog of the test only.
+        with tempfile.TemporaryDirectory() as directory:
+            with self.settings(AGORA_CATALOG_DIR=directory):
+                self.assertSameOutput(queryset, StorySerializer, StoryValuesSerializer)
+
+    def test_post_list_num_queries(self):
+        url = reverse("qna-post-list")
+        self.client.get(url)
+        cache.clear()
+
+        # The validators, the page and the tags.
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data.get("results")), len(self.posts))
+
+    def test_post_list_pagination(self):
+        url = reverse("qna-post-list")
+        response = self.client.get(url, {"page_size": 3, "ordering": "created_at"})
+        response = self.client.get(response.data.get("next"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual(
+            [result.get("pk") for result in response.data.get("results")],
+            [self.posts[-1].pk],
+        )
@@ -0,0 +1,50 @@
+import re
+import unicodedata
+
+# Precomposed Hangul syllables. Conjoining jamo are composed by NFC first.
+HANGUL_PATTERN = re.compile("[가-힣]+")
+
+# Both are indexed. Trigrams are far more selective than the common bigrams,
+# e.g. '니다', and are searched for whenever the term is long enough.
+NGRAM_SIZES = (2, 3)
+
+
+def ngrams(text, n=NGRAM_SIZES[0]):
+    """
+    Split the Hangul runs in the text into overlapping character n-grams.
+
+    Korean words carry their particles and endings without any whitespace,
+    e.g. '장고를', so whole words are useless as search terms.
+    Runs shorter than 'n' syllables produce no n-grams at all.
+    """
+    text = unicodedata.normalize("NFC", text or "")
+    grams = set()
+
+    for run in HANGUL_PATTERN.findall(text):
+        grams.update(run[i : i + n] for i in range(len(run) - n + 1))
+
+    return grams
+
+
+def index_ngrams(text):
+    """
+    All the bigrams and trigrams of the text, to be indexed.
+    """
+    return set().union(*(ngrams(text, n) for n in NGRAM_SIZES))
+
+
+def query_ngrams(text):
+    """
+    The n-grams to look up for a search term, the longest indexed ones of each
+    Hangul run: the trigrams, or the bigram of a run of two syllables.
+    Every text containing the term has all of them.
+    """
+    text = unicodedata.normalize("NFC", text or "")
+    grams = set()
+
+    for run in HANGUL_PATTERN.findall(text):
+        n = min(len(run), max(NGRAM_SIZES))
+        if n >= min(NGRAM_SIZES):
+            grams.update(ngrams(run, n))
+
+    return grams
@@ -1,11 +1,27 @@
 from django.urls import include, path
 from rest_framework.routers import SimpleRouter
 
-from .views import AnswerViewSet, CommentViewSet, PostViewSet
+from .views import AnswerViewSet, CommentViewSet, FieldViewSet, PostViewSet, TagViewSet
 
 router = SimpleRouter()
 router.register("qna/comments", CommentViewSet, basename="comment")
 router.register("qna/posts", PostViewSet, basename="qna-post")
 router.register("qna/answers", AnswerViewSet, basename="answer")
+router.register("qna/fields", FieldViewSet, basename="qna-field")
+router.register("qna/tags", TagViewSet, basename="qna-tag")
 
-urlpatterns = (path("", include(router.urls)),)
+comment_list_actions = {"get": "list", "post": "create"}
+
+urlpatterns = (
+    path(
+        "qna/posts/<int:target_pk>/comments/",
+        CommentViewSet.as_view(comment_list_actions, target="post"),
+        name="qna-post-comment-list",
+    ),
+    path(
+        "qna/answers/<int:target_pk>/comments/",
+        CommentViewSet.as_view(comment_list_actions, target="answer"),
+        name="answer-comment-list",
+    ),
+    path("", include(router.urls)),
+)
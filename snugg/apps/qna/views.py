@@ -1,53 +1,141 @@
-from django.contrib.contenttypes.models import ContentType
+import operator
+from collections import defaultdict
+from functools import reduce
+
+from django.db.models import Q
 from django_filters import rest_framework as filters
 from rest_framework import status
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.decorators import action
+from rest_framework.exceptions import (
+    NotFound,
+    ParseError,
+    PermissionDenied,
+    ValidationError,
+)
+from rest_framework.filters import OrderingFilter
 from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
-from rest_framework.viewsets import ModelViewSet
+from rest_framework.viewsets import GenericViewSet, ModelViewSet
 
-from .models import Answer, Comment, Post
+from snugg.cache import cached_response, response_cache
+from snugg.mixins import (
+    ConditionalGetMixin,
+    LimitMixin,
+    SparseFieldsMixin,
+    StreamingListMixin,
+    ValuesListMixin,
+)
+
+from .models import Answer, Comment, Post, TagStat
 from .schemas import (
     comment_create_view,
     comment_list_view,
+    comment_thread_view,
     comment_viewset_schema,
+    field_list_view,
     post_viewset_schema,
+    tag_list_view,
+)
+from .search import NgramSearchFilter
+from .serializers import (
+    AcceptAnswerSerializer,
+    AnswerSerializer,
+    AnswerValuesSerializer,
+    CommentSerializer,
+    CommentThreadSerializer,
+    FieldTreeSerializer,
+    PostDiscussionSerializer,
+    PostSerializer,
+    PostValuesSerializer,
+    TagStatSerializer,
 )
-from .serializers import AnswerSerializer, CommentSerializer, PostSerializer
+from .targets import COMMENT_TARGETS
+from .taxonomy import field_tree
 
 
 class PostFilter(filters.FilterSet):
-    field = filters.CharFilter(field_name="field__name", lookup_expr="iexact")
-    tag = filters.CharFilter(field_name="tags__name", lookup_expr="iexact")
+    field = filters.CharFilter(method="filter_field")
+    field_tree = filters.CharFilter(method="filter_field_tree")
+    tag = filters.CharFilter(method="filter_tags_all")
+    tags_any = filters.CharFilter(method="filter_tags_any")
+    tags_all = filters.CharFilter(method="filter_tags_all")
 
     class Meta:
         model = Post
         fields = ("writer",)
 
+    @staticmethod
+    def get_tag_names(value):
+        return sorted({name.strip().lower() for name in value.split(",")} - {""})
+
+    def filter_tags_any(self, queryset, name, value):
+        return queryset.filter(tag_names__overlap=self.get_tag_names(value))
+
+    def filter_tags_all(self, queryset, name, value):
+        return queryset.filter(tag_names__contains=self.get_tag_names(value))
+
+    def filter_field(self, queryset, name, value):
+        fields = field_tree.filter(value)
+        if not fields:
+            return queryset.none()
+
+        return queryset.filter(field_id__in=[field.pk for field in fields])
+
+    def filter_field_tree(self, queryset, name, value):
+        """
+        Filter by the fields of the name and all of their descendants,
+        as a single range for each of them.
+        """
+        fields = field_tree.filter(value)
+        if not fields:
+            return queryset.none()
+
+        return queryset.filter(
+            reduce(
+                operator.or_,
+                (
+                    Q(
+                        field__tree_id=field.tree_id,
+                        field__lft__gte=field.lft,
+                        field__rght__lte=field.rght,
+                    )
+                    for field in fields
+                ),
+            )
+        )
+
 
 class PostPagination(CursorPagination):
     page_size = 10
     page_size_query_param = "page_size"
+    max_page_size = 100
 
 
 class CommentPagination(CursorPagination):
     page_size = 10
     page_size_query_param = "page_size"
+    max_page_size = 100
 
 
 @post_viewset_schema
-class PostViewSet(ModelViewSet):
+class PostViewSet(
+    ConditionalGetMixin, SparseFieldsMixin, ValuesListMixin, ModelViewSet
+):
     queryset = Post.objects.select_related("field", "writer").prefetch_related("tags")
     serializer_class = PostSerializer
+    values_serializer_class = PostValuesSerializer
     filter_backends = (
+        NgramSearchFilter,
         OrderingFilter,
-        SearchFilter,
         filters.DjangoFilterBackend,
     )
     filterset_class = PostFilter
     ordering_fields = (
         "created_at",
         "updated_at",
+        "search_rank",
+        "answer_count",
+        "comment_count",
     )
     search_fields = (
         "title",
@@ -55,6 +143,9 @@ class PostViewSet(ModelViewSet):
     )
     ordering = "-created_at"
     pagination_class = PostPagination
+    validator_fields = Post.counter_fields
+    deferrable_fields = ("content",)
+    compact_excluded_fields = ("content",)
 
     # def retrieve(self, request, *args, **kwargs):
     #     response = super().retrieve(request, *args, **kwargs)
@@ -67,6 +158,7 @@ class PostViewSet(ModelViewSet):
     #     }
     #     return response
 
+    @cached_response("qna:posts")
     def list(self, request, *args, **kwargs):
         # Clients can set their desired search fields by passing 'search_type' parameter.
         self.search_fields = request.query_params.get(
@@ -75,6 +167,87 @@ class PostViewSet(ModelViewSet):
 
         return super().list(request, *args, **kwargs)
 
+    @cached_response("qna:post:{pk}")
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @action(detail=True, methods=["GET"], serializer_class=PostDiscussionSerializer)
+    @cached_response("qna:post:{pk}")
+    def discussion(self, request, pk=None):
+        """
+        The post, its answers and all the comments on them in a fixed number of queries.
+        """
+        post = self.get_object()
+        answers = sorted(
+            Answer.objects.select_related("writer").filter(post=post),
+            key=lambda answer: (
+                answer.pk != post.accepted_answer_id,
+                answer.created_at,
+                answer.pk,
+            ),
+        )
+
+        post_target = COMMENT_TARGETS["post"]
+        answer_target = COMMENT_TARGETS["answer"]
+        comments = (
+            Comment.objects.select_related("writer")
+            .annotate_replies_count()
+            .filter(
+                Q(content_type_id=post_target.content_type_id, object_id=post.pk)
+                | Q(
+                    content_type_id=answer_target.content_type_id,
+                    object_id__in=[answer.pk for answer in answers],
+                )
+            )
+            .order_by("created_at", "pk")
+        )
+        comments = Comment.objects.attach_replies(list(comments))
+
+        threads = defaultdict(list)
+        for comment in comments:
+            threads[(comment.content_type_id, comment.object_id)].append(comment)
+
+        for answer in answers:
+            answer.thread = threads[(answer_target.content_type_id, answer.pk)]
+
+        serializer = self.get_serializer(
+            {
+                "post": post,
+                "comments": threads[(post_target.content_type_id, post.pk)],
+                "answers": answers,
+            }
+        )
+
+        return Response(serializer.data)
+
+    @action(detail=True, methods=["POST"], serializer_class=AcceptAnswerSerializer)
+    def accept(self, request, pk=None):
+        """
+        Accept an answer of the post in a single conditional UPDATE,
+        looking into the reason only when it fails.
+        """
+        if not (pk.isascii() and pk.isdigit()):
+            raise NotFound()
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        answer_id = serializer.validated_data["answer"]
+
+        if not Post.objects.accept(pk, answer_id, request.user):
+            post = Post.objects.filter(pk=pk).values("writer", "accepted_answer")
+            post = post.first()
+            if post is None:
+                raise NotFound()
+            if post["writer"] != request.user.pk:
+                raise PermissionDenied()
+            if post["accepted_answer"] is not None:
+                raise ValidationError({"answer": "이미 채택된 답변이 있습니다."})
+            raise ValidationError({"answer": "이 질문에 달린 다른 사람의 답변만 채택할 수 있습니다."})
+
+        response_cache.invalidate_on_commit("qna:posts", f"qna:post:{pk}")
+
+        return Response(serializer.data)
+
     # def create(self, request, *args, **kwargs):
     #     response = super().create(request, *args, **kwargs)
     #     path = "/".join([MEDIA_ROOT, "images", "post", str(response.data["pk"]), ""])
@@ -103,23 +276,28 @@ class PostViewSet(ModelViewSet):
     #     return response
 
 
-class AnswerViewSet(ModelViewSet):
+class AnswerViewSet(
+    ConditionalGetMixin, SparseFieldsMixin, ValuesListMixin, ModelViewSet
+):
     queryset = Answer.objects.select_related("writer")
     serializer_class = AnswerSerializer
+    values_serializer_class = AnswerValuesSerializer
     filter_backends = (
+        NgramSearchFilter,
         OrderingFilter,
-        SearchFilter,
         filters.DjangoFilterBackend,
     )
     filterset_fields = ("writer",)
     ordering_fields = (
         "created_at",
         "updated_at",
+        "search_rank",
     )
     search_fields = ("content",)
     filterset_fields = ["post"]
     ordering = "-created_at"
     pagination_class = PostPagination
+    deferrable_fields = ("content",)
 
     # def retrieve(self, request, *args, **kwargs):
     #     response = super().retrieve(request, *args, **kwargs)
@@ -132,6 +310,7 @@ class AnswerViewSet(ModelViewSet):
     #     }
     #     return response
 
+    @cached_response("qna:answers")
     def list(self, request, *args, **kwargs):
         # Clients can set their desired search fields by passing 'search_type' parameter.
         self.search_fields = request.query_params.get("search_type", "content").split(
@@ -140,6 +319,10 @@ class AnswerViewSet(ModelViewSet):
 
         return super().list(request, *args, **kwargs)
 
+    @cached_response("qna:answer:{pk}")
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     # def create(self, request, *args, **kwargs):
     #     response = super().create(request, *args, **kwargs)
     #     path = "/".join([MEDIA_ROOT, "images", "answer", str(response.data["pk"]), ""])
@@ -169,108 +352,133 @@ class AnswerViewSet(ModelViewSet):
 
 
 @comment_viewset_schema
-class CommentViewSet(ModelViewSet):
+class CommentViewSet(
+    ConditionalGetMixin, SparseFieldsMixin, StreamingListMixin, ModelViewSet
+):
     queryset = Comment.objects.select_related("writer")
     serializer_class = CommentSerializer
     filter_backends = (OrderingFilter, filters.DjangoFilterBackend)
     ordering_fields = ("created_at", "updated_at")
     ordering = "-created_at"
     pagination_class = CommentPagination
+    validator_fields = ("replies_count",)
+    deferrable_fields = ("content",)
+
+    # Set by the nested routes, e.g. "/qna/posts/{id}/comments/".
+    target = None
+
+    def get_queryset(self):
+        return super().get_queryset().annotate_replies_count()
+
+    def get_target(self):
+        """
+        Return the comment target and its id, given by the nested route
+        or by one of the '?answer=', '?comment=' and '?post=' parameters.
+        """
+        if self.target is not None:
+            return COMMENT_TARGETS[self.target], self.kwargs["target_pk"]
+
+        for name, target in COMMENT_TARGETS.items():
+            target_pk = self.request.query_params.get(name, "")
+            if target_pk != "":
+                if not (target_pk.isascii() and target_pk.isdigit()):
+                    raise ParseError(f"{name} must be an integer.")
+                return target, int(target_pk)
+
+        return None, None
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+
+        if self.action in ("list", "thread"):
+            target, target_pk = self.get_target()
+            if target is not None:
+                queryset = target.filter_comments(queryset, target_pk)
+
+        return queryset
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+
+        # An empty page is the only case where the target might not exist.
+        if not page:
+            target, target_pk = self.get_target()
+            if target is not None and not target.exists(target_pk):
+                raise NotFound()
+
+        return page
+
+    @comment_thread_view
+    @action(detail=False, methods=["GET"], serializer_class=CommentThreadSerializer)
+    @cached_response("qna:comments")
+    def thread(self, request):
+        target, _ = self.get_target()
+        if target is None or target.model is Comment:
+            raise ParseError("Comment target must be a post or an answer.")
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page = Comment.objects.attach_replies(self.paginate_queryset(queryset))
+        serializer = self.get_serializer(page, many=True)
+
+        return self.get_paginated_response(serializer.data)
 
     @comment_list_view
+    @cached_response("qna:comments")
     def list(self, request, *args, **kwargs):
-        answer = request.GET.get("answer", "")
-        comment = request.GET.get("comment", "")
-        post = request.GET.get("post", "")
-        if answer != "":
-            if answer.isnumeric():
-                answer = int(answer)
-            else:
-                return Response(status=status.HTTP_400_BAD_REQUEST)
-            if not Answer.objects.filter(id=answer).exists():
-                return Response(status=status.HTTP_404_NOT_FOUND)
-            self.queryset = self.queryset.filter(
-                content_type=ContentType.objects.get_for_model(Answer).id,
-                object_id=answer,
-            )
-        elif comment != "":
-            if comment.isnumeric():
-                comment = int(comment)
-            else:
-                return Response(status=status.HTTP_400_BAD_REQUEST)
-            if not Comment.objects.filter(id=comment).exists():
-                return Response(status=status.HTTP_404_NOT_FOUND)
-            self.queryset = self.queryset.filter(
-                content_type=ContentType.objects.get_for_model(Comment).id,
-                object_id=comment,
-            )
-        elif post != "":
-            if post.isnumeric():
-                post = int(post)
-            else:
-                return Response(status=status.HTTP_400_BAD_REQUEST)
-            if not Post.objects.filter(id=post).exists():
-                return Response(status=status.HTTP_404_NOT_FOUND)
-            self.queryset = self.queryset.filter(
-                content_type=ContentType.objects.get_for_model(Post).id,
-                object_id=post,
-            )
+        return super().list(request, *args, **kwargs)
 
-        return super().list(self, request, *args, **kwargs)
+    @cached_response("qna:comment:{pk}")
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
     @comment_create_view
     def create(self, request, *args, **kwargs):
-        answer = request.GET.get("answer", "")
-        comment = request.GET.get("comment", "")
-        post = request.GET.get("post", "")
+        target, target_pk = self.get_target()
+        if target is None:
+            raise ParseError("Comment target is not given.")
+        if not target.exists(target_pk):
+            raise NotFound()
+
         data = request.data.copy()
-        if answer != "":
-            if answer.isnumeric():
-                answer = int(answer)
-            else:
-                return Response(status=status.HTTP_400_BAD_REQUEST)
-            if not Answer.objects.filter(id=answer).exists():
-                return Response(status=status.HTTP_404_NOT_FOUND)
-            data["object_id"] = answer
-            data["content_type"] = ContentType.objects.get_for_model(Answer).id
-            serializer = self.get_serializer(data=data)
-            serializer.is_valid(raise_exception=True)
-            super().perform_create(serializer)
-            headers = super().get_success_headers(serializer.data)
-            return Response(
-                serializer.data, status=status.HTTP_201_CREATED, headers=headers
-            )
-        elif comment != "":
-            if comment.isnumeric():
-                comment = int(comment)
-            else:
-                return Response(status=status.HTTP_400_BAD_REQUEST)
-            if not Comment.objects.filter(id=comment).exists():
-                return Response(status=status.HTTP_404_NOT_FOUND)
-            data["object_id"] = comment
-            data["content_type"] = ContentType.objects.get_for_model(Comment).id
-            serializer = self.get_serializer(data=data)
-            serializer.is_valid(raise_exception=True)
-            super().perform_create(serializer)
-            headers = super().get_success_headers(serializer.data)
-            return Response(
-                serializer.data, status=status.HTTP_201_CREATED, headers=headers
-            )
-        elif post != "":
-            if post.isnumeric():
-                post = int(post)
-            else:
-                return Response(status=status.HTTP_400_BAD_REQUEST)
-            if not Post.objects.filter(id=post).exists():
-                return Response(status=status.HTTP_404_NOT_FOUND)
-            data["object_id"] = post
-            data["content_type"] = ContentType.objects.get_for_model(Post).pk
-            serializer = self.get_serializer(data=data)
-            serializer.is_valid(raise_exception=True)
-            super().perform_create(serializer)
-            headers = super().get_success_headers(serializer.data)
-            return Response(
-                serializer.data, status=status.HTTP_201_CREATED, headers=headers
-            )
-        else:
-            return Response(status=status.HTTP_400_BAD_REQUEST)
+        data["object_id"] = target_pk
+        data["content_type"] = target.content_type_id
+        serializer = self.get_serializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        headers = self.get_success_headers(serializer.data)
+
+        return Response(
+            serializer.data, status=status.HTTP_201_CREATED, headers=headers
+        )
+
+
+class FieldViewSet(GenericViewSet):
+    serializer_class = FieldTreeSerializer
+    pagination_class = None
+
+    @field_list_view
+    def list(self, request):
+        return Response(field_tree.as_tree())
+
+
+class TagViewSet(LimitMixin, GenericViewSet):
+    """
+    Popular tags, or the tags starting with the given 'prefix' while typing.
+    """
+
+    queryset = TagStat.objects.filter(count__gt=0).order_by("-count", "name")
+    serializer_class = TagStatSerializer
+    pagination_class = None
+
+    @tag_list_view
+    @cached_response("qna:tags")
+    def list(self, request):
+        queryset = self.get_queryset()
+
+        prefix = request.query_params.get("prefix", "").strip().lower()
+        if prefix:
+            queryset = queryset.filter(name__startswith=prefix)
+
+        serializer = self.get_serializer(queryset[: self.get_limit()], many=True)
+
+        return Response(serializer.data)
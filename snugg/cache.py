@@ -0,0 +1,179 @@
+import hashlib
+import time
+from functools import partial, wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+# Stored along with the response data, so that hits can be conditional too.
+VALIDATOR_HEADERS = ("ETag", "Last-Modified")
+
+
+class ResponseCache:
+    """
+    Caches response data of viewset actions, invalidated by namespaces.
+
+    Every cached response depends on some namespaces, e.g. "qna:posts" or
+    "qna:post:1". Each namespace has a version stored in the cache, and the
+    versions are a part of the cache keys. Invalidating a namespace bumps its
+    version, so that all the responses depending on it are never read again.
+
+    Missing versions are initialized with the current time rather than 0,
+    so that an evicted version never brings stale responses back.
+    """
+
+    prefix = "response-cache"
+
+    # Names of the cached actions, used to report the metrics.
+    names = set()
+
+    def __init__(self, alias=None, timeout=None):
+        self.alias = alias or settings.RESPONSE_CACHE_ALIAS
+        self.timeout = timeout or settings.RESPONSE_CACHE_TIMEOUT
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def version_key(self, namespace):
+        return f"{self.prefix}:version:{namespace}"
+
+    def metrics_key(self, name, outcome):
+        return f"{self.prefix}:metrics:{name}:{outcome}"
+
+    def get_versions(self, namespaces):
+        keys = [self.version_key(namespace) for namespace in namespaces]
+        versions = self.cache.get_many(keys)
+
+        for key in keys:
+            if key not in versions:
+                self.cache.add(key, time.time_ns(), timeout=None)
+                versions[key] = self.cache.get(key)
+
+        return [versions[key] for key in keys]
+
+    def invalidate(self, *namespaces):
+        for namespace in set(namespaces):
+            key = self.version_key(namespace)
+            try:
+                self.cache.incr(key)
+            except ValueError:
+                self.cache.set(key, time.time_ns(), timeout=None)
+
+    def invalidate_on_commit(self, *namespaces):
+        """
+        Invalidate the namespaces now, and once more after the current
+        transaction is committed. Otherwise concurrent requests could cache
+        the data read before the commit under the new versions.
+        """
+        self.invalidate(*namespaces)
+        transaction.on_commit(partial(self.invalidate, *namespaces))
+
+    def make_key(self, name, request, namespaces):
+        """
+        The key consists of the absolute path, the query parameters sorted,
+        the authentication state and the versions of the namespaces.
+        Cursors are part of the query parameters.
+        """
+        query = sorted(
+            (key, value)
+            for key, values in request.query_params.lists()
+            for value in values
+        )
+        parts = (
+            request.get_host(),
+            request.path,
+            repr(query),
+            str(request.user.is_authenticated),
+            repr(self.get_versions(namespaces)),
+        )
+        digest = hashlib.sha1("\n".join(parts).encode()).hexdigest()
+
+        return f"{self.prefix}:response:{name}:{digest}"
+
+    def count(self, name, outcome):
+        key = self.metrics_key(name, outcome)
+        self.cache.add(key, 0, timeout=None)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            pass
+
+    def get_metrics(self):
+        metrics = {}
+        for name in sorted(self.names):
+            hits = self.cache.get(self.metrics_key(name, "hit"), 0)
+            misses = self.cache.get(self.metrics_key(name, "miss"), 0)
+            metrics[name] = {"hit": hits, "miss": misses}
+
+        return metrics
+
+
+response_cache = ResponseCache()
+
+
+def cached_response(*namespaces, timeout=None):
+    """
+    Cache the successful GET responses of a viewset action.
+    The validator headers are cached as well, to answer conditional requests.
+
+    Namespaces are formatted with the URL keyword arguments of the view,
+    e.g. @cached_response("qna:post:{pk}").
+    'timeout' overrides the one of the response cache, e.g. for hot keys.
+    """
+
+    def decorator(method):
+        name = method.__qualname__
+        ResponseCache.names.add(name)
+
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            if request.method != "GET":
+                return method(self, request, *args, **kwargs)
+
+            key = response_cache.make_key(
+                name,
+                request,
+                [namespace.format(**self.kwargs) for namespace in namespaces],
+            )
+            cached = response_cache.cache.get(key)
+
+            if cached is not None:
+                response_cache.count(name, "hit")
+                response = get_conditional_response(
+                    request,
+                    etag=cached["headers"].get("ETag"),
+                    last_modified=parse_http_date_safe(
+                        cached["headers"].get("Last-Modified")
+                    ),
+                ) or Response(cached["data"])
+                for header, value in cached["headers"].items():
+                    response[header] = value
+                response["X-Cache"] = "HIT"
+                return response
+
+            response_cache.count(name, "miss")
+            response = method(self, request, *args, **kwargs)
+            # Streamed responses are large pages, not worth keeping in the cache.
+            if response.status_code == status.HTTP_200_OK and not response.streaming:
+                cached = {
+                    "data": response.data,
+                    "headers": {
+                        header: response[header]
+                        for header in VALIDATOR_HEADERS
+                        if response.has_header(header)
+                    },
+                }
+                response_cache.cache.set(key, cached, timeout or response_cache.timeout)
+            response["X-Cache"] = "MISS"
+
+            return response
+
+        return wrapper
+
+    return decorator
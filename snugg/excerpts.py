@@ -0,0 +1,31 @@
+import html
+import re
+
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+EXCERPT_LENGTH = 120
+
+# Markdown syntax, keeping the text of links, images and emphasis.
+MARKDOWN_PATTERNS = (
+    (re.compile(r"^\s*(```|~~~).*$", re.MULTILINE), ""),
+    (re.compile(r"!?\[([^\]]*)\]\([^)]*\)"), r"\1"),
+    (re.compile(r"^\s{0,3}(#{1,6}|>+|[-*+]|\d+[.)])\s+", re.MULTILINE), ""),
+    (re.compile(r"(\*{1,2}|~~|`+)(?=\S)(.+?)(?<=\S)\1"), r"\2"),
+    # Underscores within words, e.g. snake_case, are not emphasis.
+    (re.compile(r"(?<!\w)(_{1,2})(?=\S)(.+?)(?<=\S)\1(?!\w)"), r"\2"),
+)
+WHITESPACE = re.compile(r"\s+")
+
+
+def make_excerpt(content, length=EXCERPT_LENGTH):
+    """
+    Return the beginning of the content as plain text in a single line,
+    without HTML tags nor Markdown syntax, truncated to 'length' characters.
+    """
+    text = html.unescape(strip_tags(content))
+    for pattern, replacement in MARKDOWN_PATTERNS:
+        text = pattern.sub(replacement, text)
+    text = WHITESPACE.sub(" ", text).strip()
+
+    return Truncator(text).chars(length)
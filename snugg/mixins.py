@@ -1,3 +1,17 @@
+import hashlib
+from functools import partial
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max, Sum
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.exceptions import ParseError
+from rest_framework.response import Response
+
+from snugg.renderers import FastJSONRenderer
+
+
 class ViewSetActionPermissionMixin:
     def get_permissions(self):
         """Return the permission classes based on action.
@@ -40,3 +54,263 @@ class ViewSetActionPermissionMixin:
                 permission()
                 for permission in (permission_classes or self.permission_classes)
             ]
+
+
+class ConditionalGetMixin:
+    """
+    Conditional GET support for the 'list' and 'retrieve' actions.
+
+    The validators come from a single aggregate query over the filtered
+    queryset: the latest 'last_modified_field', the number of objects and the
+    sums of 'validator_fields', which are the fields changing without touching
+    'last_modified_field', e.g. counters. If the client's 'If-None-Match' or
+    'If-Modified-Since' matches, '304 Not Modified' is returned right away,
+    without loading nor serializing any object.
+    """
+
+    last_modified_field = "updated_at"
+    validator_fields = ()
+
+    def get_validators(self, queryset):
+        aggregates = {
+            "last_modified": Max(self.last_modified_field),
+            "count": Count("pk"),
+        }
+        for field in self.validator_fields:
+            aggregates[f"{field}_sum"] = Sum(field)
+
+        values = queryset.order_by().aggregate(**aggregates)
+
+        if not values["count"]:
+            return None, None
+
+        # The same objects make different pages, e.g. with another cursor.
+        parts = [self.request.get_full_path()]
+        parts.extend(str(values[key]) for key in aggregates)
+        etag = quote_etag(hashlib.sha1("\n".join(parts).encode()).hexdigest())
+
+        return etag, values["last_modified"]
+
+    def get_conditional_response(self, queryset, get_response):
+        etag, last_modified = self.get_validators(queryset)
+
+        if etag is None:
+            return get_response()
+
+        headers = {"ETag": etag, "Last-Modified": http_date(last_modified.timestamp())}
+        response = get_conditional_response(
+            self.request, etag=etag, last_modified=int(last_modified.timestamp())
+        )
+
+        if response is None:
+            response = get_response()
+            if response.status_code != 200:
+                return response
+
+        for header, value in headers.items():
+            response[header] = value
+
+        return response
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        get_response = partial(super().list, request, *args, **kwargs)
+
+        return self.get_conditional_response(queryset, get_response)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        get_response = partial(super().retrieve, request, *args, **kwargs)
+
+        try:
+            queryset = self.filter_queryset(self.get_queryset()).filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        except (TypeError, ValueError, ValidationError):
+            # Malformed lookups are left to 'get_object', which raises 404.
+            return get_response()
+
+        return self.get_conditional_response(queryset, get_response)
+
+
+class LimitMixin:
+    """
+    The number of objects of the unpaginated actions, e.g. while typing,
+    given by the 'limit' query parameter up to 'max_limit'.
+    """
+
+    default_limit = 10
+    max_limit = 50
+
+    def get_limit(self):
+        limit = self.request.query_params.get("limit", "")
+        if limit == "":
+            return self.default_limit
+        # Not 'isnumeric', which accepts e.g. '²' that 'int' does not.
+        if not (limit.isascii() and limit.isdigit()):
+            raise ParseError("limit must be an integer.")
+
+        return min(int(limit), self.max_limit)
+
+
+class SparseFieldsMixin:
+    """
+    Trim the 'list' and 'retrieve' responses to the comma-separated top-level
+    fields of the 'fields' query parameter, e.g. '?fields=pk,title'.
+
+    The 'deferrable_fields' left out, e.g. large text columns, are deferred
+    in the queryset, so that they are not even read from the database.
+    With 'ValuesListMixin', only the values of the given fields are read.
+
+    '?compact=true' leaves out the 'compact_excluded_fields' as well,
+    e.g. the content which has an excerpt.
+    """
+
+    fields_query_param = "fields"
+    compact_query_param = "compact"
+    deferrable_fields = ()
+    compact_excluded_fields = ()
+
+    def get_sparse_fields(self):
+        if self.action not in ("list", "retrieve"):
+            return None
+
+        if not hasattr(self, "_sparse_fields"):
+            self._sparse_fields = self.parse_sparse_fields()
+
+        return self._sparse_fields
+
+    def parse_sparse_fields(self):
+        value = self.request.query_params.get(self.fields_query_param, "")
+        fields = {name.strip() for name in value.split(",")} - {""}
+        compact = self.request.query_params.get(self.compact_query_param) in (
+            "true",
+            "1",
+        )
+        if not fields and not compact:
+            return None
+
+        available = {
+            name
+            for name, field in self.get_serializer_class()().fields.items()
+            if not field.write_only
+        }
+        unknown = fields - available
+        if unknown:
+            raise ParseError(f"Unknown fields: {', '.join(sorted(unknown))}.")
+
+        if compact:
+            fields = (fields or available) - set(self.compact_excluded_fields)
+
+        return fields
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+
+        deferred = [name for name in self.deferrable_fields if name not in fields]
+        return queryset.defer(*deferred) if deferred else queryset
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            trimmed = serializer.child if kwargs.get("many") else serializer
+            for name in set(trimmed.fields) - fields:
+                del trimmed.fields[name]
+
+        return serializer
+
+    def get_values_fields(self):
+        return self.get_sparse_fields()
+
+
+class StreamingListMixin:
+    """
+    Stream the pages of the 'list' action with more than 'stream_page_size'
+    objects, rendering them one at a time into a 'StreamingHttpResponse'
+    instead of buffering all of them and the whole body.
+    The output is the same as the one of the buffered pages.
+    """
+
+    stream_page_size = 50
+
+    def get_list_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+    def iter_representation(self, objects):
+        serializer = self.get_serializer(objects, many=True)
+        return map(serializer.child.to_representation, objects)
+
+    def should_stream(self, page):
+        return len(page) > self.stream_page_size and isinstance(
+            self.request.accepted_renderer, FastJSONRenderer
+        )
+
+    def get_streaming_response(self, page):
+        renderer = self.request.accepted_renderer
+        data = self.paginator.get_paginated_response(
+            self.iter_representation(page)
+        ).data
+
+        return StreamingHttpResponse(
+            renderer.render_stream(data), content_type=renderer.media_type
+        )
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.get_list_queryset()
+
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(list(self.iter_representation(queryset)))
+
+        if self.should_stream(page):
+            return self.get_streaming_response(page)
+
+        return self.get_paginated_response(list(self.iter_representation(page)))
+
+
+class ValuesListMixin(StreamingListMixin):
+    """
+    Serialize the 'list' action from '.values()' rows with 'values_serializer_class',
+    skipping the model instances and the serializer fields.
+    The output is the same as the one of 'serializer_class'.
+    """
+
+    values_serializer_class = None
+
+    def get_values_fields(self):
+        """
+        The fields to serialize, all of them by default.
+        """
+        return None
+
+    def get_values_queryset(self, queryset):
+        paths = list(self.values_serializer_class.get_paths(self.get_values_fields()))
+
+        # Cursor paginations read their positions from the rows.
+        get_ordering = getattr(self.paginator, "get_ordering", None)
+        if get_ordering is not None:
+            ordering = get_ordering(self.request, queryset, self)
+            paths.extend(field.lstrip("-") for field in ordering)
+
+        return queryset.prefetch_related(None).values(*dict.fromkeys(paths))
+
+    def get_list_queryset(self):
+        queryset = super().get_list_queryset()
+        if self.values_serializer_class is None:
+            return queryset
+
+        return self.get_values_queryset(queryset)
+
+    def iter_representation(self, objects):
+        if self.values_serializer_class is None:
+            return super().iter_representation(objects)
+
+        return self.values_serializer_class.iter_representation(
+            objects, self.get_values_fields()
+        )
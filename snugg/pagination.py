@@ -0,0 +1,186 @@
+import orjson
+from django.core.exceptions import ValidationError
+from django.core.paginator import EmptyPage, Page, Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+
+
+def estimate_count(queryset):
+    """
+    The number of rows of the queryset estimated by the query planner from
+    the statistics of the tables, without running the query.
+    """
+    sql, params = queryset.order_by().query.sql_with_params()
+
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        [plans] = cursor.fetchone()
+
+    return plans[0]["Plan"]["Plan Rows"]
+
+
+class EstimatedPage(Page):
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Similar to `Paginator`, but counting the objects from the estimate of the
+    query planner. Small results, whose estimates are the least accurate, are
+    counted exactly as it is cheap.
+
+    The pages are not checked against the estimate. Each one is read with an
+    extra object instead, to tell whether another page follows.
+    """
+
+    exact_count_threshold = 1000
+
+    @cached_property
+    def count(self):
+        estimate = estimate_count(self.object_list)
+        if estimate < self.exact_count_threshold:
+            return self.object_list.count()
+
+        return estimate
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if int(number) < 1:
+                raise
+            return int(number)
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        objects = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not objects and number > 1:
+            raise EmptyPage("That page contains no results")
+
+        has_next = len(objects) > self.per_page
+        # The last page tells the exact count.
+        if not has_next:
+            self.count = bottom + len(objects)
+        elif "count" in self.__dict__:
+            self.count = max(self.count, bottom + len(objects))
+
+        return EstimatedPage(objects[: self.per_page], number, self, has_next)
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Similar to `CursorPagination`, but the positions are made of the values of
+    all the 'ordering' fields, the last one being unique, e.g. ("name", "pk").
+    Each page is then read from the position of the previous one by an index
+    on the same fields, rather than by an offset from a non-unique position.
+
+    The ordering is always the given one, whatever the ordering filters.
+    """
+
+    ordering = ("pk",)
+
+    def get_ordering(self, request, queryset, view):
+        return self.ordering
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = [
+            instance[field] if isinstance(instance, dict) else getattr(instance, field)
+            for field in (order.lstrip("-") for order in ordering)
+        ]
+
+        return orjson.dumps(values).decode()
+
+    def decode_position(self, position):
+        try:
+            values = orjson.loads(position)
+        except orjson.JSONDecodeError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        return values
+
+    def get_position_filter(self, position, reverse):
+        """
+        Select the objects after the position, field by field,
+        e.g. 'name > %s OR (name = %s AND id > %s)'.
+        """
+        condition = None
+        for order, value in reversed(list(zip(self.ordering, position))):
+            field = order.lstrip("-")
+            lookup = "lt" if order.startswith("-") != reverse else "gt"
+            after = Q(**{f"{field}__{lookup}": value})
+            condition = (
+                after if condition is None else after | Q(**{field: value}) & condition
+            )
+
+        # A range on the first field, which the index can scan.
+        first = self.ordering[0]
+        lookup = "lte" if first.startswith("-") != reverse else "gte"
+        return Q(**{f"{first.lstrip('-')}__{lookup}": position[0]}) & condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            offset, reverse, current_position = 0, False, None
+        else:
+            offset, reverse, current_position = self.cursor
+
+        ordering = self.ordering
+        if reverse:
+            ordering = [
+                order[1:] if order.startswith("-") else f"-{order}"
+                for order in ordering
+            ]
+        queryset = queryset.order_by(*ordering)
+
+        if current_position is not None:
+            position = self.decode_position(current_position)
+            try:
+                queryset = queryset.filter(self.get_position_filter(position, reverse))
+            except (TypeError, ValueError, ValidationError):
+                # The values do not fit the fields.
+                raise NotFound(self.invalid_cursor_message)
+
+        results = list(queryset[offset : offset + self.page_size + 1])
+        self.page = results[: self.page_size]
+
+        has_following_position = len(results) > len(self.page)
+        following_position = None
+        if has_following_position:
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = current_position is not None or offset > 0
+            self.has_previous = has_following_position
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = current_position is not None or offset > 0
+            self.next_position = following_position
+            self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
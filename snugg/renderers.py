@@ -0,0 +1,78 @@
+from collections.abc import Iterator
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Datetimes are left to the encoder of DRF, which formats them its own way.
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+# Line breaks in JavaScript, escaped by DRF but not by orjson.
+LINE_SEPARATORS = (("\u2028".encode(), b"\\u2028"), ("\u2029".encode(), b"\\u2029"))
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Similar to `JSONRenderer`, but rendering with orjson.
+
+    The output is the same, types unknown to orjson being converted by the
+    encoder of DRF, except for floats: they may be formatted differently,
+    e.g. '1e-5' rather than '1e-05', and non-finite ones are rendered as null
+    rather than rejected. Indented output, e.g. for the browsable API, is left
+    to `JSONRenderer`.
+    """
+
+    # Rendered objects are sent in chunks of at least this many bytes.
+    chunk_size = 64 * 1024
+
+    def __init__(self):
+        self.encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        return self.dumps(data)
+
+    def dumps(self, data):
+        rendered = orjson.dumps(
+            data, default=self.encoder.default, option=ORJSON_OPTIONS
+        )
+        for separator, escaped in LINE_SEPARATORS:
+            rendered = rendered.replace(separator, escaped)
+
+        return rendered
+
+    def render_stream(self, data):
+        """
+        Render a dict by chunks, the iterators among its values being
+        rendered as lists, one object at a time.
+        """
+        chunk = bytearray(b"{")
+
+        for index, (key, value) in enumerate(data.items()):
+            if index:
+                chunk += b","
+            chunk += self.dumps(key) + b":"
+
+            if not isinstance(value, Iterator):
+                chunk += self.dumps(value)
+                continue
+
+            chunk += b"["
+            for position, item in enumerate(value):
+                if position:
+                    chunk += b","
+                chunk += self.dumps(item)
+
+                if len(chunk) >= self.chunk_size:
+                    yield bytes(chunk)
+                    chunk.clear()
+            chunk += b"]"
+
+        chunk += b"}"
+        yield bytes(chunk)
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/4.0/ref/settings/
 """
 import datetime
 import os
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -68,6 +69,10 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
         "snugg.permissions.FullObjectPermissions",
     ),
+    "DEFAULT_RENDERER_CLASSES": (
+        "snugg.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_FILTER_BACKENDS": ("django_filters.rest_framework.DjangoFilterBackend",),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.CursorPagination",
@@ -192,6 +197,32 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+# Local memory cache unless a shared backend is configured, e.g.
+# CACHE_BACKEND="django.core.cache.backends.memcached.PyMemcacheCache"
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
+
+# Response cache settings
+# Responses are invalidated by writes. The timeout only bounds staleness of
+# data changed outside of the models' write paths, e.g. a user's name.
+
+RESPONSE_CACHE_ALIAS = "default"
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", 60 * 60))
+
+# Snapshots of the lecture catalog, shared by the processes of a host.
+AGORA_CATALOG_DIR = os.getenv(
+    "AGORA_CATALOG_DIR", os.path.join(tempfile.gettempdir(), "snugg-catalog")
+)
+
 # JWT Token Settings
 
 SIMPLE_JWT = {
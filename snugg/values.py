@@ -0,0 +1,238 @@
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+
+
+class Lookup:
+    """
+    Output the value of the given lookup as it is, e.g. Lookup("field__name").
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+
+class Related:
+    """
+    Output the values fetched at once for all the rows, e.g. many-to-many fields.
+
+    'fetch' takes the primary keys of the objects, or the values of 'path' if
+    given, and returns a dict mapping each of them to its value.
+    Missing objects get 'default()'.
+    """
+
+    def __init__(self, fetch, default=list, path=None):
+        self.fetch = fetch
+        self.default = default
+        self.path = path
+
+
+class Nested:
+    """
+    Output a nested serializer, with its own overrides.
+    """
+
+    def __init__(self, serializer_class, overrides=None):
+        self.serializer_class = serializer_class
+        self.overrides = overrides or {}
+
+
+class ValuesSerializer:
+    """
+    Read-only serialization of '.values()' rows, producing the same output as
+    'serializer_class' does for model instances.
+
+    The fields of 'serializer_class' are compiled once into getters reading
+    the rows. Plain fields, primary key and slug related fields and nested
+    model serializers are compiled automatically. Any other field must be given
+    in 'overrides' as a 'Lookup', a 'Related' or a 'Nested'.
+
+    class PostValuesSerializer(ValuesSerializer):
+        serializer_class = PostSerializer
+        overrides = {"tags": Related(get_post_tags)}
+
+    rows = queryset.values(*PostValuesSerializer.get_paths())
+    data = PostValuesSerializer.to_representation(rows)
+
+    Every method takes the top-level 'fields' to output, all of them by default.
+    Only the values these fields need are then read from the database.
+    """
+
+    serializer_class = None
+    overrides = {}
+
+    _compiled = None
+
+    @classmethod
+    def compile(cls, fields=None):
+        # Compiled lazily, since the fields can only be built once apps are ready.
+        if cls.__dict__.get("_compiled") is None:
+            cls._compiled = {}
+
+        key = None if fields is None else frozenset(fields)
+        if key not in cls._compiled:
+            cls._compiled[key] = Compiler().compile(
+                cls.serializer_class, cls.overrides, key
+            )
+
+        return cls._compiled[key]
+
+    @classmethod
+    def get_paths(cls, fields=None):
+        return cls.compile(fields).paths
+
+    @classmethod
+    def to_representation(cls, rows, fields=None):
+        return cls.compile(fields).to_representation(list(rows))
+
+    @classmethod
+    def iter_representation(cls, rows, fields=None):
+        return cls.compile(fields).iter_representation(list(rows))
+
+
+class CompiledSerializer:
+    def __init__(self, paths, getters, related):
+        self.paths = paths
+        self.getters = getters
+        self.related = related
+
+    def fetch_related(self, rows):
+        fetched = {}
+        for key, (pk_path, related) in self.related.items():
+            pks = {row[pk_path] for row in rows if row[pk_path] is not None}
+            fetched[key] = related.fetch(pks) if pks else {}
+
+        return fetched
+
+    def to_representation(self, rows):
+        return list(self.iter_representation(rows))
+
+    def iter_representation(self, rows):
+        # The related values are fetched right away, not when iterating.
+        fetched = self.fetch_related(rows)
+
+        return (
+            {name: getter(row, fetched) for name, getter in self.getters}
+            for row in rows
+        )
+
+
+class Compiler:
+    def __init__(self):
+        self.paths = []
+        self.related = {}
+
+    def compile(self, serializer_class, overrides, fields=None):
+        getters = self.compile_fields(serializer_class, overrides, "", fields)
+
+        return CompiledSerializer(
+            list(dict.fromkeys(self.paths)), getters, self.related
+        )
+
+    def add_path(self, path):
+        self.paths.append(path)
+        return path
+
+    def compile_fields(self, serializer_class, overrides, prefix, fields=None):
+        pk_path = self.add_path(f"{prefix}pk")
+        getters = []
+
+        for name, field in serializer_class().fields.items():
+            if field.write_only or (fields is not None and name not in fields):
+                continue
+
+            override = overrides.get(name)
+            path = prefix + "__".join(field.source_attrs)
+
+            if isinstance(override, Lookup):
+                getters.append((name, self.compile_lookup(prefix + override.path)))
+            elif isinstance(override, Related):
+                key = f"{prefix}{name}"
+                key_path = pk_path
+                if override.path is not None:
+                    key_path = self.add_path(prefix + override.path)
+                self.related[key] = (key_path, override)
+                getters.append((name, self.compile_related(key, key_path, override)))
+            elif isinstance(override, Nested):
+                getters.append(
+                    (
+                        name,
+                        self.compile_nested(
+                            override.serializer_class, override.overrides, path
+                        ),
+                    )
+                )
+            elif override is not None:
+                raise ImproperlyConfigured(f"Unknown override of '{name}'.")
+            elif isinstance(field, serializers.PrimaryKeyRelatedField):
+                getters.append((name, self.compile_lookup(path, field.pk_field)))
+            elif isinstance(field, serializers.SlugRelatedField):
+                getters.append(
+                    (name, self.compile_lookup(f"{path}__{field.slug_field}"))
+                )
+            elif isinstance(field, serializers.ModelSerializer):
+                getters.append((name, self.compile_nested(type(field), {}, path)))
+            elif self.is_plain(field):
+                getters.append((name, self.compile_lookup(path, field)))
+            else:
+                raise ImproperlyConfigured(
+                    f"'{serializer_class.__name__}.{name}' must be overridden "
+                    "to be serialized from values."
+                )
+
+        return getters
+
+    @staticmethod
+    def is_plain(field):
+        return not isinstance(
+            field,
+            (
+                serializers.BaseSerializer,
+                serializers.RelatedField,
+                serializers.ManyRelatedField,
+                serializers.SerializerMethodField,
+                serializers.FileField,
+                serializers.ListField,
+                serializers.DictField,
+            ),
+        )
+
+    def compile_lookup(self, path, field=None):
+        self.add_path(path)
+
+        if field is None:
+            return lambda row, fetched: row[path]
+
+        to_representation = field.to_representation
+
+        def getter(row, fetched):
+            value = row[path]
+            return None if value is None else to_representation(value)
+
+        return getter
+
+    def compile_related(self, key, pk_path, related):
+        default = related.default
+
+        def getter(row, fetched):
+            pk = row[pk_path]
+            if pk is None:
+                return None
+
+            value = fetched[key].get(pk)
+            return default() if value is None else value
+
+        return getter
+
+    def compile_nested(self, serializer_class, overrides, path):
+        prefix = f"{path}__"
+        getters = self.compile_fields(serializer_class, overrides, prefix)
+        pk_path = f"{prefix}pk"
+
+        def getter(row, fetched):
+            # The same as the serializers, a missing relation is None.
+            if row[pk_path] is None:
+                return None
+
+            return {name: get(row, fetched) for name, get in getters}
+
+        return getter